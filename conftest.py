@@ -1,11 +1,35 @@
 import os
 
+from core.startup_profiler import ImportTimer, StartupProfilerPlugin
+
+# Instalado antes dos demais imports para medir o custo de cada um (PROFILE_STARTUP=1).
+IMPORT_TIMER = ImportTimer.install() if os.getenv("PROFILE_STARTUP") == "1" else None
+
+import re
+import uuid
+
 import pytest
-from playwright.sync_api import Error, sync_playwright
-from pytest_html import extras as html_extras
 
+from core.base_page import DEFAULT_TIMEOUT
+from core.browser_pool import BrowserPool, BrowserUnavailable, interleave, parse_engines
+from core.run_history import (
+    BROWSER_PROPERTY,
+    DEFAULT_DB_PATH,
+    EVIDENCE_PREFIX,
+    WORKER_PROPERTY,
+    RunHistory,
+    RunHistoryPlugin,
+)
 from core.screenshot_service import ScreenshotService
+from core.selector_profiler import DEFAULT_SLOW_THRESHOLD_MS, SelectorProfiler
+from core.timeout_policy import DeadlineBudget, LocatorTimingStore, TimeoutPolicy
+from core.visual_regression_service import VisualRegressionService
+from core.web_vitals import WebVitalsCollector, aggregate_trends
+from util.dataset import load_row, open_index
+
 
+RUN_ID_KEY = pytest.StashKey[str]()
+BROWSERS_KEY = pytest.StashKey[list]()
 
 ENV_URLS = {
     "dev": "https://www.google.com",
@@ -27,6 +51,232 @@ def pytest_addoption(parser):
         default=None,
         help="URL base personalizada. Se informada, tem prioridade sobre o mapeamento por ambiente.",
     )
+    parser.addoption(
+        "--browsers",
+        action="store",
+        default="chromium",
+        help="Engines da matriz de navegadores (ex.: chromium,firefox,webkit). Com mais de uma, "
+        "os testes que usam o browser são parametrizados por engine na mesma sessão.",
+    )
+    parser.addoption(
+        "--profile-selectors",
+        action="store_true",
+        default=False,
+        help="Mede tempo de resolução e matches dos seletores dos Page Objects (reports/selector_profile/).",
+    )
+    parser.addoption(
+        "--slow-selector-ms",
+        action="store",
+        type=float,
+        default=DEFAULT_SLOW_THRESHOLD_MS,
+        help="Limite (ms) para marcar um seletor como lento no --profile-selectors.",
+    )
+    parser.addoption(
+        "--perf-metrics",
+        action="store_true",
+        default=False,
+        help="Coleta navigation timing, FCP/LCP, CLS e long tasks a cada navegação/clique (reports/perf/).",
+    )
+    parser.addoption(
+        "--adaptive-timeouts",
+        action="store_true",
+        default=False,
+        help="Usa múltiplo do p99 histórico de cada locator como timeout (histórico em .cache/timeouts/).",
+    )
+    parser.addoption(
+        "--test-budget-ms",
+        action="store",
+        type=int,
+        default=0,
+        help="Prazo total (ms) por teste compartilhado pelas ações de BasePage. 0 desativa.",
+    )
+    parser.addoption(
+        "--run-datasets",
+        action="store_true",
+        default=False,
+        help="Executa os testes com @pytest.mark.dataset (uma execução do fluxo por linha; desativados por padrão).",
+    )
+    parser.addoption(
+        "--dataset-rows",
+        action="store",
+        default=None,
+        help="Fatia de linhas dos testes com @pytest.mark.dataset (ex.: 0:1000).",
+    )
+    parser.addoption(
+        "--dataset-where",
+        action="store",
+        default=None,
+        help="Filtro por igualdade de campos nos datasets (ex.: genero=Homem,mes=Janeiro).",
+    )
+    parser.addoption(
+        "--dataset-sample",
+        action="store",
+        type=int,
+        default=None,
+        help="Quantidade de linhas sorteadas dos datasets após os filtros.",
+    )
+    parser.addoption(
+        "--dataset-seed",
+        action="store",
+        type=int,
+        default=0,
+        help="Semente do sorteio (--dataset-sample); fixa para coleta idêntica entre workers do xdist.",
+    )
+    parser.addoption(
+        "--run-history",
+        action="store",
+        default=DEFAULT_DB_PATH,
+        help="Banco SQLite com resultados, durações, workers e evidências de cada execução.",
+    )
+    parser.addoption(
+        "--no-run-history",
+        action="store_true",
+        default=False,
+        help="Não grava a execução no histórico SQLite.",
+    )
+
+
+def pytest_configure(config):
+    """Define um identificador único da execução, compartilhado com os workers do xdist."""
+    config.addinivalue_line(
+        "markers",
+        "dataset(path, rows=None, where=None, sample=None): parametriza o fixture data_row "
+        "com as linhas de um arquivo JSONL/CSV, lidas sob demanda.",
+    )
+    if hasattr(config, "workerinput"):
+        run_id = config.workerinput["testrunuid"]
+    else:
+        run_id = getattr(config.option, "testrunuid", None) or uuid.uuid4().hex
+        if hasattr(config.option, "testrunuid"):
+            config.option.testrunuid = run_id
+    config.stash[RUN_ID_KEY] = run_id
+
+    try:
+        config.stash[BROWSERS_KEY] = parse_engines(config.getoption("--browsers"))
+    except ValueError as exc:
+        raise pytest.UsageError(str(exc)) from exc
+    # Valida antes da coleta: erros em pytest_generate_tests viram erro de coleta.
+    _parse_where(config.getoption("--dataset-where"))
+    _validate_rows(config.getoption("--dataset-rows"))
+    sample = config.getoption("--dataset-sample")
+    if sample is not None and sample < 0:
+        raise pytest.UsageError(f"--dataset-sample inválido: {sample}. Informe um inteiro maior ou igual a zero.")
+
+    if (
+        not hasattr(config, "workerinput")
+        and not config.getoption("--no-run-history")
+        and not config.getoption("collectonly")
+    ):
+        config.pluginmanager.register(
+            RunHistoryPlugin(
+                RunHistory(config.getoption("--run-history")),
+                run_id,
+                env=config.getoption("--env").lower(),
+                base_url=config.getoption("--base-url") or ENV_URLS.get(config.getoption("--env").lower()),
+                workers=getattr(config.option, "numprocesses", None) or 0,
+                args=list(config.invocation_params.args),
+            ),
+            "run_history",
+        )
+
+    if os.getenv("PROFILE_STARTUP") == "1":
+        config.pluginmanager.register(
+            StartupProfilerPlugin(IMPORT_TIMER, worker_id=_worker_id(config)), "startup_profiler"
+        )
+
+
+def _parse_where(raw):
+    if not raw:
+        return None
+    pairs = [pair for pair in raw.split(",") if pair.strip()]
+    invalid = [pair for pair in pairs if "=" not in pair]
+    if invalid:
+        raise pytest.UsageError(
+            f"--dataset-where inválido: {', '.join(invalid)}. Use campo=valor separados por vírgula "
+            "(ex.: genero=Homem,mes=Janeiro)."
+        )
+    return dict(pair.strip().split("=", 1) for pair in pairs)
+
+
+def _validate_rows(raw):
+    if raw and not re.fullmatch(r"\s*-?\d*\s*:\s*-?\d*\s*", raw):
+        raise pytest.UsageError(
+            f"--dataset-rows inválido: {raw}. Use a fatia inicio:fim com inteiros (ex.: 0:1000, 500: ou :100)."
+        )
+
+
+def pytest_generate_tests(metafunc):
+    """Parametriza ``browser_name`` pela matriz de navegadores e ``data_row`` pelo dataset do marker."""
+    engines = metafunc.config.stash[BROWSERS_KEY]
+    if len(engines) > 1 and "browser_name" in metafunc.fixturenames:
+        metafunc.parametrize("browser_name", engines, indirect=True)
+
+    marker = metafunc.definition.get_closest_marker("dataset")
+    if marker is None or "data_row" not in metafunc.fixturenames:
+        return
+
+    config = metafunc.config
+    index = open_index(str(config.rootpath / marker.args[0]))
+    refs = index.select(
+        rows=config.getoption("--dataset-rows") or marker.kwargs.get("rows"),
+        where=_parse_where(config.getoption("--dataset-where")) or marker.kwargs.get("where"),
+        sample=(
+            config.getoption("--dataset-sample")
+            if config.getoption("--dataset-sample") is not None
+            else marker.kwargs.get("sample")
+        ),
+        seed=config.getoption("--dataset-seed"),
+    )
+    metafunc.parametrize("data_row", refs, ids=[repr(ref) for ref in refs], indirect=True)
+
+
+def _engine_of(item):
+    """Engine usada pelo teste (``None`` quando o teste não depende do navegador)."""
+    callspec = getattr(item, "callspec", None)
+    if callspec is not None and "browser_name" in callspec.params:
+        return callspec.params["browser_name"]
+    if "browser_name" in getattr(item, "fixturenames", ()):
+        return item.config.stash[BROWSERS_KEY][0]
+    return None
+
+
+def pytest_collection_modifyitems(config, items):
+    """Pula os testes de dataset sem ``--run-datasets`` e intercala as engines da matriz
+    para que cada worker do xdist receba uma mistura delas.
+    """
+    if not config.getoption("--run-datasets"):
+        skip_dataset = pytest.mark.skip(reason="Teste orientado a dados: use --run-datasets para executá-lo.")
+        for item in items:
+            if item.get_closest_marker("dataset") is not None:
+                item.add_marker(skip_dataset)
+
+    engines = config.stash[BROWSERS_KEY]
+    if len(engines) < 2:
+        return
+
+    groups = {engine: [] for engine in engines}
+    others = []
+    for item in items:
+        engine = _engine_of(item)
+        (groups[engine] if engine else others).append(item)
+    items[:] = others + interleave(list(groups.values()))
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    if hasattr(config, "workerinput"):
+        return
+    if config.getoption("--perf-metrics"):
+        aggregate_trends(output_dir="reports/perf")
+    if config.getoption("--adaptive-timeouts"):
+        LocatorTimingStore(base_dir=".cache/timeouts").consolidate()
+
+
+def _worker_id(config) -> str:
+    """Identificador do worker pytest-xdist (ou ``local`` fora do xdist)."""
+    if hasattr(config, "workerinput"):
+        return config.workerinput.get("workerid", "local")
+    return "local"
 
 
 # ---------------- FIXTURES PLAYWRIGHT ----------------
@@ -34,29 +284,38 @@ def pytest_addoption(parser):
 
 @pytest.fixture(scope="session")
 def playwright_instance():
+    from playwright.sync_api import sync_playwright
+
     with sync_playwright() as p:
         yield p
 
 
 @pytest.fixture(scope="session")
-def browser(playwright_instance):
-    headless = os.getenv("HEADLESS", "true").lower() != "false"
-    try:
-        browser = playwright_instance.chromium.launch(headless=headless)
-    except Error as exc:  # navegadores Playwright ausentes
-        pytest.skip(
-            "Playwright browsers não encontrados. Execute 'playwright install' antes de rodar os testes.",
-            allow_module_level=True,
-        )
-        raise exc
+def browser_pool(playwright_instance):
+    pool = BrowserPool(playwright_instance, headless=os.getenv("HEADLESS", "true").lower() != "false")
+    yield pool
+    pool.close()
 
-    yield browser
-    browser.close()
+
+@pytest.fixture
+def browser_name(request, pytestconfig):
+    """Engine do teste: parâmetro da matriz (``--browsers``) ou a única engine configurada."""
+    return getattr(request, "param", pytestconfig.stash[BROWSERS_KEY][0])
+
+
+@pytest.fixture
+def browser(browser_pool, browser_name):
+    try:
+        return browser_pool.get(browser_name)
+    except BrowserUnavailable as exc:  # navegadores Playwright ausentes
+        pytest.skip(str(exc))
 
 
 @pytest.fixture
-def context(browser, base_url):
+def context(browser, base_url, pytestconfig):
     context = browser.new_context(base_url=base_url)
+    if pytestconfig.getoption("--perf-metrics"):
+        WebVitalsCollector.install(context)
     try:
         context.tracing.start(screenshots=True, snapshots=True, sources=True)
     except Exception:
@@ -82,7 +341,7 @@ def context(browser, base_url):
 
 
 @pytest.fixture
-def page(context):
+def page(context, selector_profiler, perf_collector, timeout_policy, visual_service):
     page = context.new_page()
     console_messages = []
 
@@ -91,6 +350,10 @@ def page(context):
 
     page.on("console", _on_console)
     page.console_messages = console_messages  # type: ignore[attr-defined]
+    page.selector_profiler = selector_profiler  # type: ignore[attr-defined]
+    page.perf_collector = perf_collector  # type: ignore[attr-defined]
+    page.timeout_policy = timeout_policy  # type: ignore[attr-defined]
+    page.visual_service = visual_service  # type: ignore[attr-defined]
     yield page
 
 
@@ -102,6 +365,75 @@ def screenshot_service():
     return ScreenshotService(base_dir="evidencias")
 
 
+@pytest.fixture(scope="session")
+def selector_profiler(pytestconfig):
+    if not pytestconfig.getoption("--profile-selectors"):
+        yield None
+        return
+
+    profiler = SelectorProfiler(slow_threshold_ms=pytestconfig.getoption("--slow-selector-ms"))
+    yield profiler
+    profiler.export(output_dir="reports/selector_profile", worker_id=_worker_id(pytestconfig))
+
+
+@pytest.fixture
+def perf_collector(request, pytestconfig, base_url):
+    if not pytestconfig.getoption("--perf-metrics"):
+        return None
+
+    env = "custom" if pytestconfig.getoption("--base-url") else pytestconfig.getoption("--env").lower()
+    return WebVitalsCollector(
+        output_dir="reports/perf",
+        run_id=pytestconfig.stash[RUN_ID_KEY],
+        tags={
+            "test": request.node.nodeid,
+            "browser": _engine_of(request.node),
+            "env": env,
+            "base_url": base_url,
+            "worker": _worker_id(pytestconfig),
+        },
+    )
+
+
+@pytest.fixture(scope="session")
+def locator_timing_store(pytestconfig):
+    if not pytestconfig.getoption("--adaptive-timeouts"):
+        yield None
+        return
+
+    store = LocatorTimingStore(base_dir=".cache/timeouts")
+    yield store
+    store.save_pending(_worker_id(pytestconfig))
+
+
+@pytest.fixture
+def timeout_policy(pytestconfig, locator_timing_store, browser_name):
+    budget_ms = pytestconfig.getoption("--test-budget-ms")
+    if locator_timing_store is None and not budget_ms:
+        return None
+
+    return TimeoutPolicy(
+        default_timeout=DEFAULT_TIMEOUT,
+        store=locator_timing_store,
+        budget=DeadlineBudget(budget_ms) if budget_ms else None,
+        engine=browser_name,
+    )
+
+
+@pytest.fixture
+def data_row(request):
+    """Linha do dataset do marker ``dataset``, lida apenas quando o teste executa."""
+    if not hasattr(request, "param"):
+        pytest.fail("O fixture 'data_row' exige o marker @pytest.mark.dataset(<arquivo>).")
+    return load_row(request.param)
+
+
+@pytest.fixture
+def visual_service(browser_name):
+    # Baselines separados por engine: diferenças de renderização entre navegadores não são regressão.
+    return VisualRegressionService(baseline_dir=f"baselines/{browser_name}", diff_dir="evidencias")
+
+
 @pytest.fixture(scope="session")
 def base_url(pytestconfig):
     custom_url = pytestconfig.getoption("--base-url")
@@ -125,11 +457,22 @@ def pytest_runtest_makereport(item, call):
     """Anexa screenshot ao pytest-html somente se:
        - teste falhar
        - e pytest-html estiver ativo (usuário passou --html)
+
+    O worker e os caminhos das evidências seguem em ``report.user_properties``
+    para o histórico SQLite (``core/run_history.py``).
     """
     outcome = yield
     report = outcome.get_result()
+    report.user_properties.append((WORKER_PROPERTY, _worker_id(item.config)))
+    engine = _engine_of(item)
+    if engine:
+        report.user_properties.append((BROWSER_PROPERTY, engine))
 
     if report.when == "call" and report.failed:
+        policy = item.funcargs.get("timeout_policy")
+        if policy is not None and policy.budget is not None:
+            report.sections.append(("Orçamento de tempo (BasePage)", policy.budget.report()))
+
         page = item.funcargs.get("page")
         screenshot_service = item.funcargs.get("screenshot_service")
         context = item.funcargs.get("context")
@@ -137,11 +480,7 @@ def pytest_runtest_makereport(item, call):
         if page and screenshot_service:
             safe_name = report.nodeid.replace("::", "_").replace("/", "_")
 
-            worker_id = "local"
-            if hasattr(item.config, "workerinput"):
-                worker_id = item.config.workerinput.get("workerid", "local")
-
-            name_prefix = f"{safe_name}_{worker_id}"
+            name_prefix = f"{safe_name}_{_worker_id(item.config)}"
             screenshot_path = screenshot_service.save(page, name_prefix=name_prefix)
             console_path = screenshot_service.save_console_logs(
                 getattr(page, "console_messages", []), name_prefix=name_prefix
@@ -151,6 +490,11 @@ def pytest_runtest_makereport(item, call):
                 if context
                 else None
             )
+            for kind, path in (("screenshot", screenshot_path), ("console", console_path), ("trace", trace_path)):
+                if path:
+                    report.user_properties.append((f"{EVIDENCE_PREFIX}{kind}", str(path)))
+
+            from pytest_html import extras as html_extras
 
             extra = getattr(report, "extra", [])
             if screenshot_path is not None:
@@ -174,3 +518,30 @@ def pytest_runtest_makereport(item, call):
 
 def pytest_html_report_title(report):
     report.title = "Relatório"
+
+
+def pytest_html_results_table_header(cells):
+    cells.insert(2, '<th class="sortable" data-column-type="browser">Browser</th>')
+
+
+def pytest_html_results_table_row(report, cells):
+    cells.insert(2, f"<td class=\"col-browser\">{dict(report.user_properties).get(BROWSER_PROPERTY, '')}</td>")
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Resumo por engine quando a matriz de navegadores tem mais de uma engine."""
+    engines = config.stash[BROWSERS_KEY]
+    if len(engines) < 2:
+        return
+
+    counts = {engine: {} for engine in engines}
+    for outcome in ("passed", "failed", "error", "skipped"):
+        for report in terminalreporter.stats.get(outcome, []):
+            engine = dict(getattr(report, "user_properties", [])).get(BROWSER_PROPERTY)
+            if engine in counts:
+                counts[engine][outcome] = counts[engine].get(outcome, 0) + 1
+
+    terminalreporter.section("navegadores")
+    for engine, outcomes in counts.items():
+        summary = ", ".join(f"{total} {outcome}" for outcome, total in outcomes.items()) or "nenhum teste"
+        terminalreporter.write_line(f"{engine:<10} {summary}")
@@ -1,13 +1,26 @@
+from __future__ import annotations
+
 import re
 import logging
-from typing import Literal, Optional, Union
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator, Literal, Optional, Sequence, Union
 
-from playwright.sync_api import Locator, Page, expect
 from core.screenshot_service import ScreenshotService
+from core.selector_profiler import selector_of
+from core.timeout_policy import DeadlineExceeded
+from core.visual_regression_service import Box, VisualCheckResult, VisualRegressionService
+from util.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Locator, Page
+
+# Playwright só é carregado na primeira ação real (não na coleta dos testes).
+sync_api = lazy_import("playwright.sync_api")
 
 logger = logging.getLogger(__name__)
 
-Locatable = Union[str, Locator]
+Locatable = Union[str, "Locator"]
 DEFAULT_TIMEOUT = 30000  # 30s
 
 
@@ -17,15 +30,37 @@ class BasePage:
     # -------------------------------------------------------------------------
     # Construtor / núcleo
     # -------------------------------------------------------------------------
-    def __init__(self, page: Page, screenshot_service: Optional[ScreenshotService] = None):
-        """Guarda a instância de página e o serviço de screenshot para reutilização em helpers.
+    def __init__(
+            self,
+            page: Page,
+            screenshot_service: Optional[ScreenshotService] = None,
+            visual_service: Optional[VisualRegressionService] = None,
+    ):
+        """Guarda a instância de página e os serviços auxiliares para reutilização em helpers.
 
         Args:
             page: Instância sincronizada do Playwright utilizada pela página.
             screenshot_service: Serviço opcional para captura de screenshots em falhas.
+            visual_service: Serviço opcional de regressão visual usado nos checkpoints.
         """
         self.page = page
         self.screenshot_service = screenshot_service
+        self.visual_service = visual_service
+
+    def _locator_label(self, target: Locatable, label: Optional[str] = None) -> str:
+        """Nome do atributo do Page Object que referencia o alvo, ou o próprio seletor.
+
+        Usado para identificar locators em relatórios (perfil de seletores, métricas) e
+        no histórico de timeouts. ``label`` explícito tem prioridade: seletores montados
+        a partir de um template (ex.: a opção de um mês) devem informá-lo para que todos
+        os valores sejam agrupados sob a mesma chave.
+        """
+        if label:
+            return label
+        for name, value in vars(self).items():
+            if value is target:
+                return name
+        return target if isinstance(target, str) else selector_of(target)
 
     def _resolve_locator(self, target: Locatable) -> Locator:
         """Converte strings em Locator Playwright mantendo a flexibilidade de assinatura.
@@ -38,12 +73,82 @@ class BasePage:
         """
         return self.page.locator(target) if isinstance(target, str) else target
 
+    def _profile_selector(self, target: Locatable, resolved: Optional[Locator], label: Optional[str] = None):
+        """Com ``--profile-selectors``, mede o seletor já com o DOM pronto (após a espera da ação)."""
+        profiler = getattr(self.page, "selector_profiler", None)
+        if profiler is not None and resolved is not None:
+            profiler.profile(self, target, resolved, label=label)
+
+    @contextmanager
+    def _timeout_scope(
+            self,
+            target: Locatable,
+            timeout: Optional[int],
+            action: str,
+            learn: bool = True,
+            state: Optional[str] = None,
+            locator: Optional[Locator] = None,
+            label: Optional[str] = None,
+    ) -> Iterator[int]:
+        """Define o timeout efetivo de uma ação e contabiliza o tempo gasto nela.
+
+        Sem ``page.timeout_policy`` apenas aplica ``timeout or DEFAULT_TIMEOUT``. Com a
+        política ativa (``--adaptive-timeouts`` / ``--test-budget-ms``), o timeout vem do
+        histórico do locator e é limitado pelo prazo restante do teste.
+
+        Args:
+            target: Locator ou rótulo usado como chave no histórico/relatório.
+            timeout: Timeout explícito informado pelo chamador (tem prioridade).
+            action: Nome da ação exibido no relatório do orçamento.
+            learn: Se a duração bem-sucedida alimenta o histórico do locator. Deve ser
+                   ``False`` para ações que não esperam o elemento ficar pronto (``is_*``
+                   retornam imediatamente e ignoram o timeout).
+            state: Condição aguardada (``visible``, ``hidden``, ``editable``...); compõe a
+                   chave do histórico para não misturar, por exemplo, tempo até visível com
+                   tempo até oculto. Padrão: o próprio ``action``.
+            locator: Locator resolvido do alvo; quando informado, é medido pelo perfil de
+                     seletores somente após a ação concluir com sucesso.
+            label: Rótulo estável do alvo (ver ``_locator_label``).
+
+        Raises:
+            DeadlineExceeded: Quando a ação falha após esgotar o orçamento do teste.
+        """
+        policy = getattr(self.page, "timeout_policy", None)
+        if policy is None:
+            yield timeout or DEFAULT_TIMEOUT
+            self._profile_selector(target, locator, label)
+            return
+
+        key = f"{type(self).__name__}.{self._locator_label(target, label)}:{state or action}"
+        effective, capped_by_budget = policy.resolve(key, timeout)
+        started = time.perf_counter()
+        try:
+            yield effective
+        except DeadlineExceeded:
+            raise
+        except Exception as exc:
+            policy.spend(key, action, effective, (time.perf_counter() - started) * 1000, ok=False)
+            if capped_by_budget or policy.exhausted():
+                raise DeadlineExceeded(
+                    f"'{key}' ({action}) esgotou o orçamento do teste.\n{policy.budget.report()}"
+                ) from exc
+            raise
+        policy.spend(key, action, effective, (time.perf_counter() - started) * 1000, ok=True, learn=learn)
+        self._profile_selector(target, locator, label)
+
     # -------------------------------------------------------------------------
     # Ações de página (genéricas)
     # -------------------------------------------------------------------------
     def open(self, url: str):
-        """Abre uma URL absoluta usando o navegador controlado pelo Playwright."""
-        self.page.goto(url)
+        """Abre uma URL absoluta usando o navegador controlado pelo Playwright.
+
+        Com ``--perf-metrics`` ativo, registra navigation timing e web vitals da navegação.
+        """
+        collector = getattr(self.page, "perf_collector", None)
+        if collector is None:
+            self.page.goto(url)
+            return
+        collector.timed(self.page, type(self).__name__, "navigation", url, lambda: self.page.goto(url))
 
     def click(
             self,
@@ -67,7 +172,8 @@ class BasePage:
             timeout (Optional[int]):
                 Tempo máximo de espera (em milissegundos) para que o elemento
                 atinja o estado de visibilidade antes do clique.
-                Caso não seja informado, utiliza o valor padrão ``DEFAULT_TIMEOUT``.
+                Caso não seja informado, utiliza o valor padrão ``DEFAULT_TIMEOUT``
+                (ou o timeout adaptativo do locator com ``--adaptive-timeouts``).
 
             wait_before_ms (int):
                 Tempo (em milissegundos) a aguardar antes de realizar o clique.
@@ -80,36 +186,61 @@ class BasePage:
             TimeoutError:
                 Caso o elemento não fique visível dentro do tempo especificado.
         """
-        timeout = timeout or DEFAULT_TIMEOUT
         resolved = self._resolve_locator(locator)
 
-        resolved.wait_for(state="visible", timeout=timeout)
+        with self._timeout_scope(
+                locator, timeout, "wait_visible", state="visible", locator=resolved,
+        ) as effective:
+            resolved.wait_for(state="visible", timeout=effective)
 
         if wait_before_ms:
             self.page.wait_for_timeout(wait_before_ms)
 
-        resolved.click(timeout=timeout)
-
-    def click_and_select(self, box_locator: Locatable, option_locator: Locatable):
+        collector = getattr(self.page, "perf_collector", None)
+        with self._timeout_scope(locator, timeout, "click", learn=False) as effective:
+            if collector is None:
+                resolved.click(timeout=effective)
+                return
+            collector.timed(
+                self.page,
+                type(self).__name__,
+                "interaction",
+                self._locator_label(locator),
+                lambda: resolved.click(timeout=effective),
+            )
+
+    def click_and_select(
+            self,
+            box_locator: Locatable,
+            option_locator: Locatable,
+            option_label: Optional[str] = None,
+    ):
         """Abre um seletor customizado clicando no box e escolhe a opção desejada.
 
         Args:
             box_locator: Elemento que dispara a abertura da lista de opções.
             option_locator: Opção a ser selecionada após a lista estar visível.
+            option_label: Rótulo estável da opção em relatórios e no histórico de
+                          timeouts; use quando ``option_locator`` vem de um template.
         """
         box = self._resolve_locator(box_locator)
-        box.click()
-        option = self.wait_for_locator(option_locator)
-        option.click()
+        with self._timeout_scope(box_locator, None, "click", locator=box) as effective:
+            box.click(timeout=effective)
+        option = self.wait_for_locator(option_locator, label=option_label)
+        with self._timeout_scope(option_locator, None, "click", learn=False, label=option_label) as effective:
+            option.click(timeout=effective)
 
-    def fill(self, locator: Locatable, text: str):
+    def fill(self, locator: Locatable, text: str, timeout: Optional[int] = None):
         """Preenche um campo de texto após resolver o locator informado.
 
         Args:
             locator: Campo de texto a ser preenchido.
             text: Valor a ser inserido no campo.
+            timeout: Tempo máximo de espera pelo campo editável em milissegundos.
         """
-        self._resolve_locator(locator).fill(text)
+        resolved = self._resolve_locator(locator)
+        with self._timeout_scope(locator, timeout, "fill", state="editable", locator=resolved) as effective:
+            resolved.fill(text, timeout=effective)
 
     # -------------------------------------------------------------------------
     # Waits / helpers de locator
@@ -119,6 +250,7 @@ class BasePage:
             locator: Locatable,
             state: Literal["attached", "detached", "visible", "hidden"] = "visible",
             timeout: Optional[int] = None,
+            label: Optional[str] = None,
     ) -> Locator:
         """Aguarda um locator atingir o estado desejado e o retorna para encadeamento.
 
@@ -126,12 +258,18 @@ class BasePage:
             locator: Seletor de string ou locator a ser aguardado.
             state: Estado esperado (visível, oculto, anexado ou removido).
             timeout: Tempo máximo de espera em milissegundos.
+            label: Rótulo estável do alvo em relatórios e no histórico de timeouts.
 
         Returns:
             Locator após atingir o estado solicitado.
         """
         resolved = self._resolve_locator(locator)
-        resolved.wait_for(state=state, timeout=timeout or DEFAULT_TIMEOUT)
+        # Em hidden/detached o elemento some: não há matches a medir.
+        profiled = resolved if state in ("visible", "attached") else None
+        with self._timeout_scope(
+                locator, timeout, f"wait_{state}", state=state, locator=profiled, label=label,
+        ) as effective:
+            resolved.wait_for(state=state, timeout=effective)
         return resolved
 
     def get_visible(self, locator: Locatable, timeout: Optional[int] = None) -> Locator:
@@ -140,7 +278,7 @@ class BasePage:
         Args:
             locator: Seletor de string ou locator a ser aguardado.
             timeout: Tempo máximo de espera em milissegundos.
-                     Caso não seja informado, utiliza ``DEFAULT_TIMEOUT``.
+                     Caso não seja informado, utiliza ``DEFAULT_TIMEOUT`` (ou o timeout adaptativo).
 
         Returns:
             Locator visível, pronto para interação.
@@ -148,7 +286,7 @@ class BasePage:
         return self.wait_for_locator(
             locator=locator,
             state="visible",
-            timeout=timeout or DEFAULT_TIMEOUT,
+            timeout=timeout,
         )
 
     def get_hidden(self, locator: Locatable, timeout: Optional[int] = None) -> Locator:
@@ -157,7 +295,7 @@ class BasePage:
         Args:
             locator: Seletor de string ou locator a ser aguardado.
             timeout: Tempo máximo de espera em milissegundos.
-                     Caso não seja informado, utiliza ``DEFAULT_TIMEOUT``.
+                     Caso não seja informado, utiliza ``DEFAULT_TIMEOUT`` (ou o timeout adaptativo).
 
         Returns:
             Locator após atingir o estado oculto.
@@ -165,7 +303,7 @@ class BasePage:
         return self.wait_for_locator(
             locator=locator,
             state="hidden",
-            timeout=timeout or DEFAULT_TIMEOUT,
+            timeout=timeout,
         )
 
     def get_attached(self, locator: Locatable, timeout: Optional[int] = None) -> Locator:
@@ -174,7 +312,7 @@ class BasePage:
         Args:
             locator: Seletor de string ou locator a ser aguardado.
             timeout: Tempo máximo de espera em milissegundos.
-                     Caso não seja informado, utiliza ``DEFAULT_TIMEOUT``.
+                     Caso não seja informado, utiliza ``DEFAULT_TIMEOUT`` (ou o timeout adaptativo).
 
         Returns:
             Locator após ser anexado ao DOM.
@@ -182,7 +320,7 @@ class BasePage:
         return self.wait_for_locator(
             locator=locator,
             state="attached",
-            timeout=timeout or DEFAULT_TIMEOUT,
+            timeout=timeout,
         )
 
     def get_detached(self, locator: Locatable, timeout: Optional[int] = None) -> Locator:
@@ -191,7 +329,7 @@ class BasePage:
         Args:
             locator: Seletor de string ou locator a ser aguardado.
             timeout: Tempo máximo de espera em milissegundos.
-                     Caso não seja informado, utiliza ``DEFAULT_TIMEOUT``.
+                     Caso não seja informado, utiliza ``DEFAULT_TIMEOUT`` (ou o timeout adaptativo).
 
         Returns:
             Locator após ser removido do DOM.
@@ -199,7 +337,7 @@ class BasePage:
         return self.wait_for_locator(
             locator=locator,
             state="detached",
-            timeout=timeout or DEFAULT_TIMEOUT,
+            timeout=timeout,
         )
 
     # -------------------------------------------------------------------------
@@ -210,20 +348,26 @@ class BasePage:
 
         Não exige visibilidade, apenas presença no DOM.
         """
-        timeout = timeout or DEFAULT_TIMEOUT
         resolved = self._resolve_locator(locator)
         try:
-            resolved.wait_for(state="attached", timeout=timeout)
+            with self._timeout_scope(
+                    locator, timeout, "exists", state="attached", locator=resolved,
+            ) as effective:
+                resolved.wait_for(state="attached", timeout=effective)
             return True
+        except DeadlineExceeded:
+            raise
         except Exception:
             return False
 
     def is_visible(self, locator: Locatable, timeout: Optional[int] = None) -> bool:
         """Retorna True se o elemento estiver visível dentro do timeout."""
-        timeout = timeout or DEFAULT_TIMEOUT
         resolved = self._resolve_locator(locator)
         try:
-            return resolved.is_visible(timeout=timeout)
+            with self._timeout_scope(locator, timeout, "is_visible", learn=False) as effective:
+                return resolved.is_visible(timeout=effective)
+        except DeadlineExceeded:
+            raise
         except Exception:
             return False
 
@@ -237,19 +381,23 @@ class BasePage:
         Returns:
             True quando o elemento está oculto ou não existe; caso contrário False.
         """
-        timeout = timeout or DEFAULT_TIMEOUT
         resolved = self._resolve_locator(locator)
         try:
-            return resolved.is_hidden(timeout=timeout)
+            with self._timeout_scope(locator, timeout, "is_hidden", learn=False) as effective:
+                return resolved.is_hidden(timeout=effective)
+        except DeadlineExceeded:
+            raise
         except Exception:
             return False
 
     def is_enabled(self, locator: Locatable, timeout: Optional[int] = None) -> bool:
         """Retorna True se o elemento estiver habilitado (enabled) dentro do timeout."""
-        timeout = timeout or DEFAULT_TIMEOUT
         resolved = self._resolve_locator(locator)
         try:
-            return resolved.is_enabled(timeout=timeout)
+            with self._timeout_scope(locator, timeout, "is_enabled", learn=False) as effective:
+                return resolved.is_enabled(timeout=effective)
+        except DeadlineExceeded:
+            raise
         except Exception:
             return False
 
@@ -259,33 +407,39 @@ class BasePage:
 
     def is_editable(self, locator: Locatable, timeout: Optional[int] = None) -> bool:
         """Retorna True se o elemento for editável (não readonly + visível)."""
-        timeout = timeout or DEFAULT_TIMEOUT
         resolved = self._resolve_locator(locator)
         try:
-            return resolved.is_editable(timeout=timeout)
+            with self._timeout_scope(locator, timeout, "is_editable", learn=False) as effective:
+                return resolved.is_editable(timeout=effective)
+        except DeadlineExceeded:
+            raise
         except Exception:
             return False
 
     def is_checked(self, locator: Locatable, timeout: Optional[int] = None) -> bool:
         """Retorna True se o elemento estiver marcado (checkbox/radio)."""
-        timeout = timeout or DEFAULT_TIMEOUT
         resolved = self._resolve_locator(locator)
         try:
-            return resolved.is_checked(timeout=timeout)
+            with self._timeout_scope(locator, timeout, "is_checked", learn=False) as effective:
+                return resolved.is_checked(timeout=effective)
+        except DeadlineExceeded:
+            raise
         except Exception:
             return False
 
     def is_clickable(self, locator: Locatable, timeout: Optional[int] = None) -> bool:
         """Retorna True se o elemento estiver visível, habilitado e acionável."""
-        timeout = timeout or DEFAULT_TIMEOUT
         resolved = self._resolve_locator(locator)
         try:
-            resolved.wait_for(state="visible", timeout=timeout)
-            if not resolved.is_enabled(timeout=timeout):
-                return False
-            # Hover tende a falhar se estiver coberto ou fora de alcance
-            resolved.hover(timeout=timeout)
-            return True
+            with self._timeout_scope(locator, timeout, "is_clickable", learn=False) as effective:
+                resolved.wait_for(state="visible", timeout=effective)
+                if not resolved.is_enabled(timeout=effective):
+                    return False
+                # Hover tende a falhar se estiver coberto ou fora de alcance
+                resolved.hover(timeout=effective)
+                return True
+        except DeadlineExceeded:
+            raise
         except Exception:
             return False
 
@@ -310,7 +464,10 @@ class BasePage:
             extra={"locator_strategy": "get_by_text", "expected_text": text},
         )
         try:
-            expect(self.page.get_by_text(text)).to_be_visible(timeout=timeout or DEFAULT_TIMEOUT)
+            with self._timeout_scope(
+                    f"text={text}", timeout, "should_see_text", state="visible",
+            ) as effective:
+                sync_api.expect(self.page.get_by_text(text)).to_be_visible(timeout=effective)
         except AssertionError:
             if screenshot_on_fail and self.screenshot_service:
                 self.screenshot_service.save(self.page, f"erro_should_see_{text}")
@@ -318,37 +475,123 @@ class BasePage:
 
     def expect_visible(self, locator: Locatable, timeout: Optional[int] = None):
         """Asserta que o locator está visível dentro do tempo limite informado."""
-        expect(self._resolve_locator(locator)).to_be_visible(timeout=timeout or DEFAULT_TIMEOUT)
+        resolved = self._resolve_locator(locator)
+        with self._timeout_scope(
+                locator, timeout, "expect_visible", state="visible", locator=resolved,
+        ) as effective:
+            sync_api.expect(resolved).to_be_visible(timeout=effective)
 
     def expect_hidden(self, locator: Locatable, timeout: Optional[int] = None):
         """Asserta que o locator permanece oculto ou inexistente em tela."""
-        expect(self._resolve_locator(locator)).to_be_hidden(timeout=timeout or DEFAULT_TIMEOUT)
+        resolved = self._resolve_locator(locator)
+        with self._timeout_scope(locator, timeout, "expect_hidden", state="hidden") as effective:
+            sync_api.expect(resolved).to_be_hidden(timeout=effective)
 
     def expect_text(self, locator: Locatable, text: str, timeout: Optional[int] = None):
         """Verifica se o locator apresenta exatamente o texto esperado."""
-        expect(self._resolve_locator(locator)).to_have_text(text, timeout=timeout or DEFAULT_TIMEOUT)
+        resolved = self._resolve_locator(locator)
+        with self._timeout_scope(locator, timeout, "expect_text", locator=resolved) as effective:
+            sync_api.expect(resolved).to_have_text(text, timeout=effective)
 
     def expect_text_contains(self, locator: Locatable, text: str, timeout: Optional[int] = None):
         """Confirma que o locator contém o trecho de texto fornecido."""
-        expect(self._resolve_locator(locator)).to_contain_text(text, timeout=timeout or DEFAULT_TIMEOUT)
+        resolved = self._resolve_locator(locator)
+        with self._timeout_scope(locator, timeout, "expect_text_contains", locator=resolved) as effective:
+            sync_api.expect(resolved).to_contain_text(text, timeout=effective)
 
     # -------------------------------------------------------------------------
     # Validações de URL / título
     # -------------------------------------------------------------------------
     def expect_url_is(self, url: str, timeout: Optional[int] = None):
         """Valida que a URL atual corresponde exatamente ao valor informado."""
-        expect(self.page).to_have_url(url, timeout=timeout or DEFAULT_TIMEOUT)
+        with self._timeout_scope(f"url={url}", timeout, "expect_url_is") as effective:
+            sync_api.expect(self.page).to_have_url(url, timeout=effective)
 
     def expect_url_contains(self, partial_url: str, timeout: Optional[int] = None):
         """Valida que a URL atual contém o fragmento fornecido (escapado como regex)."""
         pattern = re.compile(re.escape(partial_url))
-        expect(self.page).to_have_url(pattern, timeout=timeout or DEFAULT_TIMEOUT)
+        with self._timeout_scope(f"url~{partial_url}", timeout, "expect_url_contains") as effective:
+            sync_api.expect(self.page).to_have_url(pattern, timeout=effective)
 
     def expect_title_is(self, title: str, timeout: Optional[int] = None):
         """Confirma que o título da aba coincide exatamente com o texto esperado."""
-        expect(self.page).to_have_title(title, timeout=timeout or DEFAULT_TIMEOUT)
+        with self._timeout_scope(f"title={title}", timeout, "expect_title_is") as effective:
+            sync_api.expect(self.page).to_have_title(title, timeout=effective)
 
     def expect_title_contains(self, partial_title: str, timeout: Optional[int] = None):
         """Confirma que o título da aba contém o trecho informado (usando regex escapada)."""
         pattern = re.compile(re.escape(partial_title))
-        expect(self.page).to_have_title(pattern, timeout=timeout or DEFAULT_TIMEOUT)
+        with self._timeout_scope(f"title~{partial_title}", timeout, "expect_title_contains") as effective:
+            sync_api.expect(self.page).to_have_title(pattern, timeout=effective)
+
+    # -------------------------------------------------------------------------
+    # Regressão visual
+    # -------------------------------------------------------------------------
+    def _mask_boxes(self, mask: Sequence[Locatable]) -> list[Box]:
+        """Converte locators em caixas ``(x, y, largura, altura)`` na escala do screenshot."""
+        if not mask:
+            return []
+        scale = self.page.evaluate("() => window.devicePixelRatio") or 1
+        boxes: list[Box] = []
+        for target in mask:
+            resolved = self._resolve_locator(target)
+            for index in range(resolved.count()):
+                box = resolved.nth(index).bounding_box()
+                if box:
+                    boxes.append((
+                        int(box["x"] * scale),
+                        int(box["y"] * scale),
+                        int(box["width"] * scale) + 1,
+                        int(box["height"] * scale) + 1,
+                    ))
+        return boxes
+
+    def expect_visual_match(
+            self,
+            name: str,
+            mask: Sequence[Locatable] = (),
+            pixel_tolerance: Optional[int] = None,
+            max_diff_ratio: Optional[float] = None,
+    ) -> VisualCheckResult:
+        """Checkpoint visual: compara o viewport atual com o baseline aprovado mais próximo.
+
+        Na primeira execução de um checkpoint o screenshot vira baseline. Regiões
+        dinâmicas (datas, banners, avatares) podem ser ignoradas via ``mask``.
+
+        Args:
+            name: Identificador único do checkpoint visual.
+            mask: Locators cujas áreas são desconsideradas na comparação.
+            pixel_tolerance: Diferença máxima por canal (0-255) considerada igual.
+            max_diff_ratio: Fração máxima de pixels divergentes aceita.
+
+        Returns:
+            Resultado da comparação (baseline usado, distância de hash e diff).
+
+        Raises:
+            AssertionError: Quando a diferença excede ``max_diff_ratio``.
+            RuntimeError: Quando nenhum serviço visual foi informado ao Page Object nem
+                anexado à página (``page.visual_service``).
+        """
+        service = self.visual_service or getattr(self.page, "visual_service", None)
+        if service is None:
+            raise RuntimeError(
+                "Nenhum VisualRegressionService disponível: use o fixture 'page' (baselines por engine) "
+                "ou informe visual_service ao Page Object."
+            )
+        result = service.check(
+            self.page.screenshot(),
+            name,
+            masks=self._mask_boxes(mask),
+            pixel_tolerance=pixel_tolerance,
+            max_diff_ratio=max_diff_ratio,
+        )
+        logger.info(
+            "Visual checkpoint",
+            extra={"checkpoint": name, "diff_ratio": result.diff_ratio, "hash_distance": result.hash_distance},
+        )
+        if not result.passed:
+            raise AssertionError(
+                f"Checkpoint visual '{name}' divergiu do baseline {result.baseline_path}: "
+                f"{result.diff_ratio:.2%} dos pixels diferentes (diff em {result.diff_path})."
+            )
+        return result
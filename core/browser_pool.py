@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Sequence
+
+from util.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Browser, Playwright
+
+sync_api = lazy_import("playwright.sync_api")
+
+BROWSER_ENGINES = ("chromium", "firefox", "webkit")
+
+
+class BrowserUnavailable(RuntimeError):
+    """Engine solicitada não pôde ser iniciada (normalmente falta ``playwright install``)."""
+
+
+def parse_engines(raw: str) -> List[str]:
+    """Converte ``chromium,firefox`` na lista de engines, validando nomes e removendo repetições."""
+    engines: List[str] = []
+    for engine in (part.strip().lower() for part in raw.split(",")):
+        if not engine:
+            continue
+        if engine not in BROWSER_ENGINES:
+            raise ValueError(f"Navegador '{engine}' não suportado. Use um de: {', '.join(BROWSER_ENGINES)}.")
+        if engine not in engines:
+            engines.append(engine)
+    if not engines:
+        raise ValueError("Informe ao menos um navegador (ex.: --browsers=chromium,firefox).")
+    return engines
+
+
+def interleave(groups: Sequence[list]) -> list:
+    """Intercala os grupos (round-robin), preservando a ordem interna de cada um."""
+    interleaved = []
+    for position in range(max((len(group) for group in groups), default=0)):
+        interleaved.extend(group[position] for group in groups if position < len(group))
+    return interleaved
+
+
+class BrowserPool:
+    """Um navegador por engine, iniciado apenas quando o primeiro teste daquela engine o solicita.
+
+    Cada processo (worker do xdist) mantém o seu pool; falhas de inicialização são
+    memorizadas para que os demais testes da engine sejam pulados sem nova tentativa.
+    """
+
+    def __init__(self, playwright: Playwright, headless: bool = True):
+        self.playwright = playwright
+        self.headless = headless
+        self.browsers: Dict[str, Browser] = {}
+        self.failures: Dict[str, str] = {}
+
+    def get(self, engine: str) -> Browser:
+        if engine in self.browsers:
+            return self.browsers[engine]
+        if engine in self.failures:
+            raise BrowserUnavailable(self.failures[engine])
+
+        try:
+            browser = getattr(self.playwright, engine).launch(headless=self.headless)
+        except sync_api.Error as exc:
+            self.failures[engine] = (
+                f"Navegador '{engine}' não encontrado. Execute 'playwright install {engine}' "
+                f"antes de rodar os testes. ({str(exc).splitlines()[0]})"
+            )
+            raise BrowserUnavailable(self.failures[engine]) from exc
+
+        self.browsers[engine] = browser
+        return browser
+
+    def close(self):
+        for browser in self.browsers.values():
+            try:
+                browser.close()
+            except Exception:
+                pass
+        self.browsers.clear()
@@ -0,0 +1,401 @@
+import argparse
+import json
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_DB_PATH = "reports/run_history.sqlite3"
+DEFAULT_RUNS_WINDOW = 20
+FLUSH_EVERY = 50
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id       TEXT PRIMARY KEY,
+    started_at   TEXT NOT NULL,
+    finished_at  TEXT,
+    env          TEXT,
+    base_url     TEXT,
+    workers      INTEGER,
+    args         TEXT,
+    exit_status  INTEGER,
+    passed       INTEGER,
+    failed       INTEGER,
+    skipped      INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_runs_started ON runs(started_at);
+
+CREATE TABLE IF NOT EXISTS results (
+    id           INTEGER PRIMARY KEY,
+    run_id       TEXT NOT NULL REFERENCES runs(run_id),
+    nodeid       TEXT NOT NULL,
+    outcome      TEXT NOT NULL,
+    duration_s   REAL NOT NULL,
+    setup_s      REAL NOT NULL,
+    teardown_s   REAL NOT NULL,
+    worker       TEXT NOT NULL,
+    browser      TEXT,
+    finished_at  TEXT NOT NULL,
+    message      TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_results_nodeid ON results(nodeid, finished_at);
+CREATE INDEX IF NOT EXISTS idx_results_run ON results(run_id, outcome);
+
+CREATE TABLE IF NOT EXISTS evidence (
+    result_id    INTEGER NOT NULL REFERENCES results(id),
+    kind         TEXT NOT NULL,
+    path         TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_evidence_result ON evidence(result_id);
+
+CREATE VIEW IF NOT EXISTS test_stats AS
+SELECT nodeid,
+       COUNT(*)                                  AS executions,
+       SUM(outcome = 'passed')                   AS passed,
+       SUM(outcome IN ('failed', 'error'))       AS failed,
+       AVG(CASE WHEN outcome != 'skipped' THEN duration_s END) AS avg_duration_s,
+       MAX(duration_s)                           AS max_duration_s,
+       MAX(finished_at)                          AS last_run_at
+FROM results
+GROUP BY nodeid;
+"""
+
+EVIDENCE_PREFIX = "evidence:"
+WORKER_PROPERTY = "worker"
+BROWSER_PROPERTY = "browser"
+
+
+class RunHistory:
+    """Histórico local das execuções em SQLite (resultados, durações, workers e evidências).
+
+    Escrito apenas pelo processo controlador (os relatórios dos workers do xdist chegam
+    a ele via ``pytest_runtest_logreport``), em lotes de ``FLUSH_EVERY`` testes. As
+    fases setup/call/teardown de cada teste são consolidadas em uma única linha de
+    ``results``; os caminhos de evidência vêm de ``report.user_properties``.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.db_path))
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(_SCHEMA)
+        self._migrate()
+        self.run_id: Optional[str] = None
+        self._open: Dict[tuple, dict] = {}
+        self._pending: List[dict] = []
+
+    def _migrate(self):
+        """Adiciona colunas criadas após a primeira versão do banco."""
+        columns = {row["name"] for row in self.connection.execute("PRAGMA table_info(results)")}
+        if "browser" not in columns:
+            self.connection.execute("ALTER TABLE results ADD COLUMN browser TEXT")
+            self.connection.commit()
+
+    # -------------------------------------------------------------------------
+    # Escrita (hooks do pytest)
+    # -------------------------------------------------------------------------
+    def start_run(
+        self,
+        run_id: str,
+        env: Optional[str] = None,
+        base_url: Optional[str] = None,
+        workers: int = 0,
+        args: Optional[List[str]] = None,
+    ):
+        self.run_id = run_id
+        self.connection.execute(
+            "INSERT OR REPLACE INTO runs (run_id, started_at, env, base_url, workers, args) VALUES (?, ?, ?, ?, ?, ?)",
+            (run_id, _now(), env, base_url, workers, " ".join(args or [])),
+        )
+        self.connection.commit()
+
+    def add_report(self, report):
+        """Acumula a fase do ``TestReport`` e agenda a gravação ao receber o teardown."""
+        properties = dict(report.user_properties)
+        key = (report.nodeid, properties.get(WORKER_PROPERTY, "local"))
+        entry = self._open.setdefault(
+            key,
+            {
+                "nodeid": report.nodeid,
+                "worker": key[1],
+                "browser": properties.get(BROWSER_PROPERTY),
+                "outcome": "passed",
+                "duration_s": 0.0,
+                "setup_s": 0.0,
+                "teardown_s": 0.0,
+                "message": None,
+                "evidence": {},
+            },
+        )
+        if report.when == "call":
+            entry["duration_s"] = report.duration
+        else:
+            entry[f"{report.when}_s"] = report.duration
+
+        if report.failed:
+            # Falha em setup/teardown é erro de infraestrutura, não do teste.
+            entry["outcome"] = "failed" if report.when == "call" else "error"
+            entry["message"] = _short_message(report)
+        elif report.skipped and entry["outcome"] == "passed":
+            entry["outcome"] = "skipped"
+
+        for name, value in properties.items():
+            if name.startswith(EVIDENCE_PREFIX) and value:
+                entry["evidence"][name[len(EVIDENCE_PREFIX):]] = str(value)
+
+        if report.when == "teardown":
+            entry["finished_at"] = _now()
+            self._pending.append(self._open.pop(key))
+            if len(self._pending) >= FLUSH_EVERY:
+                self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        with self.connection:
+            for entry in self._pending:
+                cursor = self.connection.execute(
+                    "INSERT INTO results (run_id, nodeid, outcome, duration_s, setup_s, teardown_s, worker,"
+                    " browser, finished_at, message) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        self.run_id,
+                        entry["nodeid"],
+                        entry["outcome"],
+                        entry["duration_s"],
+                        entry["setup_s"],
+                        entry["teardown_s"],
+                        entry["worker"],
+                        entry["browser"],
+                        entry["finished_at"],
+                        entry["message"],
+                    ),
+                )
+                self.connection.executemany(
+                    "INSERT INTO evidence (result_id, kind, path) VALUES (?, ?, ?)",
+                    [(cursor.lastrowid, kind, path) for kind, path in entry["evidence"].items()],
+                )
+        self._pending = []
+
+    def finish_run(self, exit_status: int):
+        self.flush()
+        counts = dict(
+            self.connection.execute(
+                "SELECT outcome, COUNT(*) FROM results WHERE run_id = ? GROUP BY outcome", (self.run_id,)
+            ).fetchall()
+        )
+        self.connection.execute(
+            "UPDATE runs SET finished_at = ?, exit_status = ?, passed = ?, failed = ?, skipped = ? WHERE run_id = ?",
+            (
+                _now(),
+                int(exit_status),
+                counts.get("passed", 0),
+                counts.get("failed", 0) + counts.get("error", 0),
+                counts.get("skipped", 0),
+                self.run_id,
+            ),
+        )
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    # -------------------------------------------------------------------------
+    # Consultas (CLI, agendamento e dashboards)
+    # -------------------------------------------------------------------------
+    def _recent_runs_clause(self) -> str:
+        return "run_id IN (SELECT run_id FROM runs ORDER BY started_at DESC LIMIT ?)"
+
+    def flaky(self, runs: int = DEFAULT_RUNS_WINDOW, limit: int = 20) -> List[dict]:
+        """Testes que passaram e falharam nas últimas ``runs`` execuções (maior taxa de falha primeiro)."""
+        rows = self.connection.execute(
+            f"""
+            SELECT nodeid,
+                   SUM(outcome = 'passed') AS passed,
+                   SUM(outcome IN ('failed', 'error')) AS failed,
+                   COUNT(DISTINCT run_id) AS runs,
+                   MAX(CASE WHEN outcome IN ('failed', 'error') THEN finished_at END) AS last_failure
+            FROM results
+            WHERE {self._recent_runs_clause()}
+            GROUP BY nodeid
+            HAVING passed > 0 AND failed > 0
+            ORDER BY CAST(failed AS REAL) / (passed + failed) DESC, failed DESC
+            LIMIT ?
+            """,
+            (runs, limit),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def slowest(self, runs: int = DEFAULT_RUNS_WINDOW, limit: int = 20) -> List[dict]:
+        """Testes com maior duração média (fase call) nas últimas ``runs`` execuções."""
+        rows = self.connection.execute(
+            f"""
+            SELECT nodeid,
+                   COUNT(*) AS executions,
+                   AVG(duration_s) AS avg_duration_s,
+                   MAX(duration_s) AS max_duration_s,
+                   AVG(setup_s + teardown_s) AS avg_fixtures_s
+            FROM results
+            WHERE outcome != 'skipped' AND {self._recent_runs_clause()}
+            GROUP BY nodeid
+            ORDER BY avg_duration_s DESC
+            LIMIT ?
+            """,
+            (runs, limit),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def artifacts(self, nodeid: str, limit: int = 5) -> List[dict]:
+        """Últimas execuções de ``nodeid`` (exato ou, sem correspondência, por trecho) com evidências."""
+        query = """
+            SELECT r.id, r.run_id, r.nodeid, r.outcome, r.worker, r.browser, r.finished_at, r.message
+            FROM results r
+            WHERE r.nodeid {operator} ?
+            ORDER BY r.finished_at DESC
+            LIMIT ?
+        """
+        rows = self.connection.execute(query.format(operator="="), (nodeid, limit)).fetchall()
+        if not rows:
+            rows = self.connection.execute(query.format(operator="LIKE"), (f"%{nodeid}%", limit)).fetchall()
+
+        results = []
+        for row in rows:
+            item = dict(row)
+            item["evidence"] = {
+                kind: path
+                for kind, path in self.connection.execute(
+                    "SELECT kind, path FROM evidence WHERE result_id = ?", (item.pop("id"),)
+                )
+            }
+            results.append(item)
+        return results
+
+    def average_durations(self, runs: int = DEFAULT_RUNS_WINDOW) -> Dict[str, float]:
+        """Duração média (setup + call + teardown) por teste, para ordenar/distribuir execuções."""
+        rows = self.connection.execute(
+            f"""
+            SELECT nodeid, AVG(setup_s + duration_s + teardown_s)
+            FROM results
+            WHERE outcome != 'skipped' AND {self._recent_runs_clause()}
+            GROUP BY nodeid
+            """,
+            (runs,),
+        ).fetchall()
+        return dict(rows)
+
+
+class RunHistoryPlugin:
+    """Plugin do pytest (registrado só no controlador) que alimenta o ``RunHistory``."""
+
+    def __init__(self, history: RunHistory, run_id: str, **run_info):
+        self.history = history
+        self.run_id = run_id
+        self.run_info = run_info
+
+    def pytest_sessionstart(self, session):
+        self.history.start_run(self.run_id, **self.run_info)
+
+    def pytest_runtest_logreport(self, report):
+        self.history.add_report(report)
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        self.history.finish_run(exitstatus)
+        self.history.close()
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="milliseconds")
+
+
+def _short_message(report) -> Optional[str]:
+    """Primeira linha ``E ...`` do traceback (ou a última linha do longrepr)."""
+    lines = (getattr(report, "longreprtext", "") or "").strip().splitlines()
+    if not lines:
+        return None
+    error_lines = [line[1:].strip() for line in lines if line.startswith("E ")]
+    return (error_lines[0] if error_lines else lines[-1])[:500]
+
+
+# -----------------------------------------------------------------------------
+# CLI: python -m core.run_history {flaky,slowest,artifacts}
+# -----------------------------------------------------------------------------
+def _print_table(rows: List[dict], columns: List[str]):
+    if not rows:
+        print("Nenhum resultado.")
+        return
+    widths = {column: max(len(column), *(len(_format(row[column])) for row in rows)) for column in columns}
+    print("  ".join(column.ljust(widths[column]) for column in columns))
+    for row in rows:
+        print("  ".join(_format(row[column]).ljust(widths[column]) for column in columns))
+
+
+def _format(value) -> str:
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return "" if value is None else str(value)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Consulta o histórico local de execuções do pytest.")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="Arquivo SQLite do histórico.")
+    parser.add_argument("--json", action="store_true", help="Saída em JSON (dashboards/scripts).")
+
+    # As mesmas opções também são aceitas após o subcomando; SUPPRESS preserva o valor
+    # informado antes dele quando a opção não é repetida.
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--db", default=argparse.SUPPRESS, help="Arquivo SQLite do histórico.")
+    common.add_argument("--json", action="store_true", default=argparse.SUPPRESS, help="Saída em JSON.")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    flaky = commands.add_parser(
+        "flaky", parents=[common], help="Testes instáveis (passaram e falharam) nas últimas execuções."
+    )
+    slowest = commands.add_parser("slowest", parents=[common], help="Testes mais lentos nas últimas execuções.")
+    for command in (flaky, slowest):
+        command.add_argument("--runs", type=int, default=DEFAULT_RUNS_WINDOW, help="Execuções consideradas.")
+        command.add_argument("--limit", type=int, default=20, help="Quantidade de testes exibidos.")
+
+    artifacts = commands.add_parser("artifacts", parents=[common], help="Últimas evidências de um teste.")
+    artifacts.add_argument("nodeid", help="Nodeid completo ou trecho (ex.: test_created_account).")
+    artifacts.add_argument("--limit", type=int, default=5, help="Quantidade de execuções exibidas.")
+    args = parser.parse_args(argv)
+
+    if not Path(args.db).exists():
+        parser.exit(1, f"Histórico '{args.db}' não encontrado. Execute o pytest ao menos uma vez.\n")
+
+    history = RunHistory(args.db)
+    try:
+        if args.command == "flaky":
+            rows = history.flaky(runs=args.runs, limit=args.limit)
+            columns = ["nodeid", "passed", "failed", "runs", "last_failure"]
+        elif args.command == "slowest":
+            rows = history.slowest(runs=args.runs, limit=args.limit)
+            columns = ["nodeid", "executions", "avg_duration_s", "max_duration_s", "avg_fixtures_s"]
+        else:
+            rows = history.artifacts(args.nodeid, limit=args.limit)
+            columns = []
+    finally:
+        history.close()
+
+    if args.json:
+        json.dump(rows, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    elif args.command == "artifacts":
+        if not rows:
+            print("Nenhum resultado.")
+        for row in rows:
+            print(f"{row['finished_at']}  {row['outcome']:<8} {row['worker']:<6} run={row['run_id'][:12]}  {row['nodeid']}")
+            if row["message"]:
+                print(f"    {row['message']}")
+            for kind, path in row["evidence"].items():
+                print(f"    {kind:<11} {path}")
+    else:
+        _print_table(rows, columns)
+
+
+if __name__ == "__main__":
+    main()
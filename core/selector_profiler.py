@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import ast
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Locator, Page
+
+DEFAULT_SLOW_THRESHOLD_MS = 25.0
+
+_SELECTOR_REPR = re.compile(r"selector=(?P<selector>'.*'|\".*\")>$", re.DOTALL)
+
+# Coleta atributos estáveis do primeiro elemento casado para sugerir seletores mais baratos.
+_DESCRIBE_ELEMENT_JS = """
+(el) => {
+    const implicitRoles = {A: 'link', BUTTON: 'button', SELECT: 'combobox', TEXTAREA: 'textbox', LI: 'listitem'};
+    const inputRoles = {checkbox: 'checkbox', radio: 'radio', button: 'button', submit: 'button'};
+    let role = el.getAttribute('role');
+    if (!role && el.tagName === 'INPUT') role = inputRoles[el.type] || 'textbox';
+    if (!role) role = implicitRoles[el.tagName] || null;
+    let name = el.getAttribute('aria-label');
+    const labelledBy = el.getAttribute('aria-labelledby');
+    if (!name && labelledBy) {
+        name = labelledBy.split(/\\s+/).map(id => (document.getElementById(id) || {}).textContent || '').join(' ');
+    }
+    if (!name && el.labels && el.labels.length) name = el.labels[0].textContent;
+    if (!name) name = (el.innerText || '').split('\\n')[0];
+    return {
+        tag: el.tagName.toLowerCase(),
+        id: el.id || null,
+        name: el.getAttribute('name'),
+        testId: el.getAttribute('data-testid'),
+        role: role,
+        accessibleName: (name || '').trim().slice(0, 80) || null,
+    };
+}
+"""
+
+
+def selector_of(locator: Locator) -> str:
+    """Extrai a string de seletor de um ``Locator`` (exposta apenas no ``repr``)."""
+    match = _SELECTOR_REPR.search(repr(locator))
+    return ast.literal_eval(match.group("selector")) if match else repr(locator)
+
+
+def is_xpath(selector: str) -> bool:
+    return any(part.strip().startswith(("//", "xpath=", "(//")) for part in selector.split(">>"))
+
+
+@dataclass
+class SelectorStats:
+    """Medições acumuladas de um atributo/seletor de Page Object."""
+
+    page_class: str
+    label: str
+    selector: str
+    samples_ms: List[float] = field(default_factory=list)
+    match_counts: List[int] = field(default_factory=list)
+    suggestions: Optional[List[dict]] = None
+
+    @property
+    def mean_ms(self) -> float:
+        return sum(self.samples_ms) / len(self.samples_ms)
+
+    def flags(self, slow_threshold_ms: float) -> List[str]:
+        flags = []
+        if self.mean_ms > slow_threshold_ms:
+            flags.append("slow")
+        if any(count > 1 for count in self.match_counts):
+            flags.append("ambiguous")
+        if all(count == 0 for count in self.match_counts):
+            flags.append("not_found_on_use")
+        if is_xpath(self.selector):
+            flags.append("xpath")
+        return flags
+
+    def to_dict(self, slow_threshold_ms: float) -> dict:
+        return {
+            "label": self.label,
+            "selector": self.selector,
+            "uses": len(self.samples_ms),
+            "mean_ms": round(self.mean_ms, 3),
+            "max_ms": round(max(self.samples_ms), 3),
+            "total_ms": round(sum(self.samples_ms), 3),
+            "match_counts": sorted(set(self.match_counts)),
+            "flags": self.flags(slow_threshold_ms),
+            "suggestions": self.suggestions or [],
+        }
+
+
+class SelectorProfiler:
+    """Mede custo de resolução e quantidade de matches dos seletores usados pelos Page Objects.
+
+    Ativado com ``--profile-selectors``: os helpers de ``BasePage`` chamam ``profile``
+    depois que a espera da ação termina com sucesso, com o DOM já pronto naquele
+    momento do fluxo (elementos renderizados após navegação/clique já estão presentes). Seletores lentos,
+    ambíguos ou em XPath recebem sugestões de estratégias equivalentes (id, name,
+    data-testid, role) que são medidas e só sugeridas quando casam exatamente um elemento.
+    """
+
+    def __init__(self, slow_threshold_ms: float = DEFAULT_SLOW_THRESHOLD_MS):
+        self.slow_threshold_ms = slow_threshold_ms
+        self.stats: Dict[Tuple[str, str], SelectorStats] = {}
+
+    @staticmethod
+    def _timed_count(locator: Locator) -> Tuple[float, int]:
+        started = time.perf_counter()
+        count = locator.count()
+        return (time.perf_counter() - started) * 1000, count
+
+    def profile(self, page_object, target, locator: Locator, label: Optional[str] = None):
+        """Registra tempo de resolução e matches do locator no DOM atual (já pronto para a ação).
+
+        ``label`` agrupa seletores gerados por template (ex.: uma opção por mês) numa única entrada.
+        """
+        try:
+            elapsed_ms, count = self._timed_count(locator)
+        except Exception:
+            return
+
+        page_class = type(page_object).__name__
+        label = page_object._locator_label(target, label)
+        key = (page_class, label)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = SelectorStats(page_class, label, selector_of(locator))
+        stats.samples_ms.append(elapsed_ms)
+        stats.match_counts.append(count)
+
+        needs_alternative = count > 1 or is_xpath(stats.selector) or elapsed_ms > self.slow_threshold_ms
+        if stats.suggestions is None and count >= 1 and needs_alternative:
+            stats.suggestions = self._suggest(page_object.page, locator, elapsed_ms)
+
+    def _candidates(self, page: Page, info: dict) -> List[Tuple[str, Locator]]:
+        candidates = []
+        if info.get("testId"):
+            candidates.append((f"page.get_by_test_id({info['testId']!r})", page.get_by_test_id(info["testId"])))
+        if info.get("id") and re.fullmatch(r"[A-Za-z][\w-]*", info["id"]):
+            css = f"#{info['id']}"
+            candidates.append((f"page.locator({css!r})", page.locator(css)))
+        if info.get("name"):
+            css = f"{info['tag']}[name='{info['name']}']"
+            candidates.append((f"page.locator({css!r})", page.locator(css)))
+        if info.get("role") and info.get("accessibleName"):
+            role, name = info["role"], info["accessibleName"]
+            candidates.append((
+                f"page.get_by_role({role!r}, name={name!r}, exact=True)",
+                page.get_by_role(role, name=name, exact=True),
+            ))
+        return candidates
+
+    def _suggest(self, page: Page, locator: Locator, baseline_ms: float) -> List[dict]:
+        try:
+            info = locator.first.evaluate(_DESCRIBE_ELEMENT_JS, timeout=1000)
+        except Exception:
+            return []
+
+        suggestions = []
+        for expression, candidate in self._candidates(page, info):
+            try:
+                elapsed_ms, count = self._timed_count(candidate)
+            except Exception:
+                continue
+            if count == 1:
+                suggestions.append({
+                    "strategy": expression,
+                    "resolution_ms": round(elapsed_ms, 3),
+                    "faster": elapsed_ms < baseline_ms,
+                })
+        return sorted(suggestions, key=lambda suggestion: suggestion["resolution_ms"])
+
+    def report(self) -> Dict[str, List[dict]]:
+        """Agrupa as medições por classe de Page Object, ordenadas pelo tempo total gasto."""
+        grouped: Dict[str, List[dict]] = {}
+        for stats in self.stats.values():
+            if not stats.samples_ms:
+                continue
+            grouped.setdefault(stats.page_class, []).append(stats.to_dict(self.slow_threshold_ms))
+        for entries in grouped.values():
+            entries.sort(key=lambda entry: entry["total_ms"], reverse=True)
+        return grouped
+
+    def export(self, output_dir: str = "reports/selector_profile", worker_id: str = "local") -> List[Path]:
+        """Grava um JSON por classe de Page Object (sufixado pelo worker em execuções xdist)."""
+        dir_path = Path(output_dir)
+        dir_path.mkdir(parents=True, exist_ok=True)
+        suffix = "" if worker_id == "local" else f".{worker_id}"
+        paths = []
+        for page_class, entries in self.report().items():
+            file_path = dir_path / f"{page_class}{suffix}.json"
+            file_path.write_text(
+                json.dumps(
+                    {"page_class": page_class, "slow_threshold_ms": self.slow_threshold_ms, "selectors": entries},
+                    indent=2,
+                    ensure_ascii=False,
+                ),
+                encoding="utf-8",
+            )
+            paths.append(file_path)
+        return paths
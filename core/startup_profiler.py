@@ -0,0 +1,171 @@
+import importlib.abc
+import json
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pytest
+
+
+@dataclass
+class ImportTiming:
+    name: str
+    cumulative_ms: float
+    self_ms: float
+
+
+class _TimingLoader(importlib.abc.Loader):
+    """Envolve o loader original medindo ``exec_module`` (tempo total e próprio)."""
+
+    def __init__(self, loader, timer: "ImportTimer"):
+        self._loader = loader
+        self._timer = timer
+
+    def __getattr__(self, attribute):
+        return getattr(self._loader, attribute)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        name = module.__name__
+        self._timer.stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            cumulative_ms = (time.perf_counter() - started) * 1000
+            children_ms = self._timer.stack.pop()
+            if self._timer.stack:
+                self._timer.stack[-1] += cumulative_ms
+            self._timer.timings.append(ImportTiming(name, cumulative_ms, cumulative_ms - children_ms))
+            # Restaura o loader original para não afetar introspecção posterior do módulo.
+            module.__loader__ = self._loader
+            if getattr(module, "__spec__", None) is not None:
+                module.__spec__.loader = self._loader
+
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """Mede o tempo de cada import realizado após ``install`` (equivalente a ``-X importtime``)."""
+
+    def __init__(self):
+        self.stack: List[float] = []
+        self.timings: List[ImportTiming] = []
+        self.installed_at = time.perf_counter()
+        self._finding: set = set()
+
+    @classmethod
+    def install(cls) -> "ImportTimer":
+        timer = cls()
+        sys.meta_path.insert(0, timer)
+        return timer
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname in self._finding:
+            return None
+        self._finding.add(fullname)
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._finding.discard(fullname)
+
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimingLoader(spec.loader, self)
+        return spec
+
+
+@dataclass
+class FixtureTiming:
+    name: str
+    scope: str
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+class StartupProfilerPlugin:
+    """Relatório de startup: imports, coleta e setup de fixtures (``PROFILE_STARTUP=1``).
+
+    Exibido no resumo do terminal e exportado em ``reports/startup_profile.json``
+    (um arquivo por worker no pytest-xdist).
+    """
+
+    def __init__(self, timer: Optional[ImportTimer], worker_id: str = "local", top: int = 15):
+        self.timer = timer
+        self.worker_id = worker_id
+        self.top = top
+        self.fixtures: Dict[tuple, FixtureTiming] = {}
+        self.collection_ms: Optional[float] = None
+        self.startup_ms: Optional[float] = None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        started = time.perf_counter()
+        yield
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        key = (fixturedef.argname, fixturedef.scope)
+        timing = self.fixtures.setdefault(key, FixtureTiming(fixturedef.argname, fixturedef.scope))
+        timing.calls += 1
+        timing.total_ms += elapsed_ms
+        timing.max_ms = max(timing.max_ms, elapsed_ms)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_collection(self, session):
+        started = time.perf_counter()
+        yield
+        finished = time.perf_counter()
+        self.collection_ms = (finished - started) * 1000
+        if self.timer is not None:
+            self.startup_ms = (finished - self.timer.installed_at) * 1000
+
+    def report(self) -> dict:
+        imports = sorted(self.timer.timings, key=lambda item: item.self_ms, reverse=True) if self.timer else []
+        fixtures = sorted(self.fixtures.values(), key=lambda item: item.total_ms, reverse=True)
+        return {
+            "worker": self.worker_id,
+            "startup_until_collected_ms": self.startup_ms,
+            "collection_ms": self.collection_ms,
+            "imports_total_ms": sum(item.self_ms for item in imports),
+            "imports": [vars(item) for item in imports],
+            "fixtures": [vars(item) for item in fixtures],
+        }
+
+    def pytest_sessionfinish(self, session):
+        if self.timer is not None:
+            self.timer.uninstall()
+        dir_path = Path("reports")
+        dir_path.mkdir(parents=True, exist_ok=True)
+        suffix = "" if self.worker_id == "local" else f".{self.worker_id}"
+        (dir_path / f"startup_profile{suffix}.json").write_text(
+            json.dumps(self.report(), indent=2), encoding="utf-8"
+        )
+
+    def pytest_terminal_summary(self, terminalreporter):
+        data = self.report()
+        terminalreporter.section("startup profile")
+        terminalreporter.write_line(
+            f"conftest -> coleta concluída: {data['startup_until_collected_ms'] or 0:.0f} ms | "
+            f"coleta: {data['collection_ms'] or 0:.0f} ms | imports: {data['imports_total_ms']:.0f} ms"
+        )
+        terminalreporter.write_line(f"{'import (tempo próprio)':<50}{'próprio':>10}{'total':>10}")
+        for item in data["imports"][: self.top]:
+            terminalreporter.write_line(f"{item['name'][:49]:<50}{item['self_ms']:>10.1f}{item['cumulative_ms']:>10.1f}")
+        terminalreporter.write_line(f"{'fixture (setup)':<40}{'escopo':>10}{'chamadas':>10}{'total':>10}{'max':>10}")
+        for item in data["fixtures"][: self.top]:
+            terminalreporter.write_line(
+                f"{item['name'][:39]:<40}{item['scope']:>10}{item['calls']:>10}"
+                f"{item['total_ms']:>10.1f}{item['max_ms']:>10.1f}"
+            )
@@ -0,0 +1,177 @@
+import json
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from util.metrics import percentile
+
+DEFAULT_MULTIPLIER = 3.0
+MIN_SAMPLES = 5
+MIN_TIMEOUT_MS = 1000
+MAX_SAMPLES_PER_LOCATOR = 200
+
+
+class DeadlineExceeded(AssertionError):
+    """Orçamento de tempo do teste esgotado durante uma ação de ``BasePage``."""
+
+
+class LocatorTimingStore:
+    """Histórico local do tempo até o locator ficar pronto, por ``PageObject.atributo``.
+
+    Cada processo (worker do xdist) grava apenas as amostras novas em
+    ``pending/<worker>.json``; o processo controlador consolida os pendentes no
+    arquivo principal ao final da sessão, evitando escrita concorrente.
+    """
+
+    FILE_NAME = "locator_timings.json"
+
+    def __init__(self, base_dir: str = ".cache/timeouts", max_samples: int = MAX_SAMPLES_PER_LOCATOR):
+        self.base_dir = Path(base_dir)
+        self.max_samples = max_samples
+        self.samples: Dict[str, List[float]] = self._read(self.base_dir / self.FILE_NAME)
+        self.new_samples: Dict[str, List[float]] = {}
+
+    @staticmethod
+    def _read(path: Path) -> Dict[str, List[float]]:
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write(self, path: Path, data: Dict[str, List[float]]):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{uuid.uuid4().hex[:8]}.tmp")
+        tmp_path.write_text(json.dumps(data, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def record(self, key: str, elapsed_ms: float):
+        value = round(elapsed_ms, 1)
+        self.samples.setdefault(key, []).append(value)
+        self.new_samples.setdefault(key, []).append(value)
+
+    def p99(self, key: str) -> Optional[float]:
+        values = self.samples.get(key, [])[-self.max_samples:]
+        return percentile(values, 99) if len(values) >= MIN_SAMPLES else None
+
+    def save_pending(self, worker_id: str):
+        """Grava as amostras desta sessão para consolidação posterior."""
+        if self.new_samples:
+            self._write(self.base_dir / "pending" / f"{worker_id}.json", self.new_samples)
+            self.new_samples = {}
+
+    def consolidate(self):
+        """Mescla os pendentes de todos os workers no histórico principal (janela limitada)."""
+        pending_files = sorted((self.base_dir / "pending").glob("*.json"))
+        if not pending_files:
+            return
+        merged = self._read(self.base_dir / self.FILE_NAME)
+        for pending_file in pending_files:
+            for key, values in self._read(pending_file).items():
+                merged[key] = (merged.get(key, []) + values)[-self.max_samples:]
+        self._write(self.base_dir / self.FILE_NAME, merged)
+        for pending_file in pending_files:
+            pending_file.unlink(missing_ok=True)
+
+
+@dataclass
+class BudgetEntry:
+    key: str
+    action: str
+    timeout_ms: int
+    elapsed_ms: float
+    ok: bool
+
+
+class DeadlineBudget:
+    """Prazo total (relógio de parede) do teste, compartilhado por todas as chamadas de ``BasePage``."""
+
+    def __init__(self, total_ms: int):
+        self.total_ms = total_ms
+        self.started_at = time.perf_counter()
+        self.entries: List[BudgetEntry] = []
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started_at) * 1000
+
+    def remaining_ms(self) -> float:
+        return self.total_ms - self.elapsed_ms()
+
+    def report(self) -> str:
+        """Resumo de onde o orçamento foi gasto, das ações mais caras para as mais baratas."""
+        tracked_ms = sum(entry.elapsed_ms for entry in self.entries)
+        lines = [
+            f"Orçamento: {self.total_ms} ms | gasto: {self.elapsed_ms():.0f} ms "
+            f"(BasePage: {tracked_ms:.0f} ms, fora de BasePage: {max(self.elapsed_ms() - tracked_ms, 0):.0f} ms)",
+            f"{'ação':<22}{'locator':<48}{'timeout':>9}{'gasto':>9}  status",
+        ]
+        for entry in sorted(self.entries, key=lambda item: item.elapsed_ms, reverse=True):
+            lines.append(
+                f"{entry.action:<22}{entry.key[:47]:<48}{entry.timeout_ms:>9}{entry.elapsed_ms:>9.0f}  "
+                f"{'ok' if entry.ok else 'FALHOU'}"
+            )
+        return "\n".join(lines)
+
+
+class TimeoutPolicy:
+    """Decide o timeout de cada ação de ``BasePage`` e contabiliza o tempo gasto.
+
+    - Com ``store`` (``--adaptive-timeouts``): sem timeout explícito, usa
+      ``multiplier × p99`` histórico do locator, entre ``MIN_TIMEOUT_MS`` e o padrão.
+    - Com ``budget`` (``--test-budget-ms``): nenhum timeout ultrapassa o prazo restante
+      do teste; ao esgotá-lo a ação falha com ``DeadlineExceeded`` e o relatório do gasto.
+    - Com ``engine`` (matriz ``--browsers``): o histórico é separado por navegador, para
+      que o webkit não herde o p99 aprendido no chromium.
+    """
+
+    def __init__(
+        self,
+        default_timeout: int,
+        store: Optional[LocatorTimingStore] = None,
+        budget: Optional[DeadlineBudget] = None,
+        multiplier: float = DEFAULT_MULTIPLIER,
+        engine: Optional[str] = None,
+    ):
+        self.default_timeout = default_timeout
+        self.store = store
+        self.budget = budget
+        self.multiplier = multiplier
+        self.engine = engine
+
+    def _history_key(self, key: str) -> str:
+        return f"{self.engine}/{key}" if self.engine else key
+
+    def resolve(self, key: str, explicit: Optional[int] = None) -> Tuple[int, bool]:
+        """Retorna o timeout efetivo e se ele foi encurtado pelo prazo restante do teste."""
+        timeout = explicit or self.default_timeout
+        if explicit is None and self.store is not None:
+            p99 = self.store.p99(self._history_key(key))
+            if p99 is not None:
+                timeout = int(min(max(p99 * self.multiplier, MIN_TIMEOUT_MS), self.default_timeout))
+
+        if self.budget is None:
+            return timeout, False
+
+        remaining = self.budget.remaining_ms()
+        if remaining <= 0:
+            raise DeadlineExceeded(
+                f"Orçamento do teste esgotado antes de '{key}'.\n{self.budget.report()}"
+            )
+        if remaining <= timeout:
+            return int(max(remaining, 1)), True
+        return timeout, False
+
+    def timeout_for(self, key: str, explicit: Optional[int] = None) -> int:
+        return self.resolve(key, explicit)[0]
+
+    def spend(self, key: str, action: str, timeout_ms: int, elapsed_ms: float, ok: bool, learn: bool = True):
+        """Registra o gasto da ação; apenas esperas bem-sucedidas alimentam o histórico."""
+        if ok and learn and self.store is not None:
+            self.store.record(self._history_key(key), elapsed_ms)
+        if self.budget is not None:
+            self.budget.entries.append(BudgetEntry(key, action, timeout_ms, elapsed_ms, ok))
+
+    def exhausted(self) -> bool:
+        return self.budget is not None and self.budget.remaining_ms() <= 0
@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from util.lazy_import import lazy_import
+
+# NumPy/Pillow só são carregados no primeiro checkpoint visual.
+np = lazy_import("numpy")
+Image = lazy_import("PIL.Image")
+
+Box = Tuple[int, int, int, int]  # x, y, largura, altura em pixels da imagem
+
+DEFAULT_PIXEL_TOLERANCE = 8  # diferença máxima por canal (0-255) ainda considerada igual
+DEFAULT_MAX_DIFF_RATIO = 0.001  # 0,1% de pixels divergentes
+HASH_SIZE = 8  # dHash de 64 bits
+INDEX_LOCK_TIMEOUT_S = 30  # lock mais antigo que isso é considerado abandonado
+
+
+@dataclass
+class VisualCheckResult:
+    """Resultado de um checkpoint visual contra o baseline mais próximo."""
+
+    name: str
+    passed: bool
+    baseline_path: Optional[Path] = None
+    hash_distance: Optional[int] = None
+    diff_ratio: float = 0.0
+    diff_path: Optional[Path] = None
+    created_baseline: bool = False
+    full_diff: bool = False
+
+
+class VisualRegressionService:
+    """Compara screenshots com baselines aprovados usando diff vetorizado (NumPy).
+
+    Mantém um índice por checkpoint com o digest exato dos pixels (para pular
+    imagens idênticas sem abrir o baseline) e o hash perceptual (dHash) usado
+    para escolher o baseline mais próximo quando existem variações (ex.:
+    viewport ou navegador diferentes). O diff pixel a pixel só é executado
+    quando os hashes divergem.
+
+    Os baselines são gravados sem máscara; as máscaras do checkpoint são aplicadas
+    ao baseline e à imagem atual no momento da comparação.
+
+    - ``UPDATE_BASELINES=1`` substitui o baseline mais próximo pela imagem atual.
+    - ``UPDATE_BASELINES=add`` registra a imagem atual como nova variação.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(
+        self,
+        baseline_dir: str = "baselines",
+        diff_dir: str = "evidencias",
+        pixel_tolerance: int = DEFAULT_PIXEL_TOLERANCE,
+        max_diff_ratio: float = DEFAULT_MAX_DIFF_RATIO,
+    ):
+        self.baseline_dir = Path(baseline_dir)
+        self.diff_dir = Path(diff_dir)
+        self.pixel_tolerance = pixel_tolerance
+        self.max_diff_ratio = max_diff_ratio
+        self._index: Optional[Dict[str, List[dict]]] = None
+
+    # -------------------------------------------------------------------------
+    # Índice de hashes
+    # -------------------------------------------------------------------------
+    @property
+    def _index_path(self) -> Path:
+        return self.baseline_dir / self.INDEX_FILE
+
+    def _read_index(self) -> Dict[str, List[dict]]:
+        if self._index_path.exists():
+            return json.loads(self._index_path.read_text(encoding="utf-8"))
+        return {}
+
+    def _load_index(self, refresh: bool = False) -> Dict[str, List[dict]]:
+        if self._index is None or refresh:
+            self._index = self._read_index()
+        return self._index
+
+    @contextmanager
+    def _index_lock(self) -> Iterator[None]:
+        """Lock entre processos (arquivo criado com ``O_EXCL``) para alterar o índice."""
+        self.baseline_dir.mkdir(parents=True, exist_ok=True)
+        lock_path = self._index_path.with_suffix(".lock")
+        while True:
+            try:
+                os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - lock_path.stat().st_mtime > INDEX_LOCK_TIMEOUT_S:
+                        lock_path.unlink(missing_ok=True)
+                        continue
+                except FileNotFoundError:
+                    continue
+                time.sleep(0.01)
+        try:
+            yield
+        finally:
+            lock_path.unlink(missing_ok=True)
+
+    def _update_index(self, mutate: Callable[[Dict[str, List[dict]]], None]):
+        """Relê o índice do disco sob lock, aplica ``mutate`` e grava de forma atômica.
+
+        Evita que workers do xdist sobrescrevam entradas criadas por outros workers.
+        """
+        with self._index_lock():
+            index = self._read_index()
+            mutate(index)
+            tmp_path = self._index_path.with_suffix(f".{uuid.uuid4().hex[:8]}.tmp")
+            tmp_path.write_text(json.dumps(index, indent=2, sort_keys=True), encoding="utf-8")
+            os.replace(tmp_path, self._index_path)
+        self._index = index
+
+    # -------------------------------------------------------------------------
+    # Operações vetorizadas
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def decode(image_bytes: bytes) -> np.ndarray:
+        """Converte bytes PNG em array RGB ``(altura, largura, 3)`` de ``uint8``."""
+        with Image.open(BytesIO(image_bytes)) as image:
+            return np.asarray(image.convert("RGB"), dtype=np.uint8)
+
+    @staticmethod
+    def apply_masks(pixels: np.ndarray, masks: Sequence[Box]) -> np.ndarray:
+        """Zera as regiões mascaradas (conteúdo dinâmico) sem alterar o array original."""
+        if not masks:
+            return pixels
+        masked = pixels.copy()
+        height, width = masked.shape[:2]
+        for x, y, w, h in masks:
+            x0, y0 = max(int(x), 0), max(int(y), 0)
+            x1, y1 = min(int(x + w), width), min(int(y + h), height)
+            if x1 > x0 and y1 > y0:
+                masked[y0:y1, x0:x1] = 0
+        return masked
+
+    @staticmethod
+    def perceptual_hash(pixels: np.ndarray) -> int:
+        """Calcula o dHash (gradiente horizontal de uma miniatura 9x8 em tons de cinza)."""
+        thumb = Image.fromarray(pixels).convert("L").resize(
+            (HASH_SIZE + 1, HASH_SIZE), Image.Resampling.BOX
+        )
+        gray = np.asarray(thumb, dtype=np.int16)
+        bits = (gray[:, 1:] > gray[:, :-1]).flatten()
+        return int(np.packbits(bits).tobytes().hex(), 16)
+
+    @staticmethod
+    def digest(pixels: np.ndarray) -> str:
+        """Digest exato do conteúdo (dimensões + pixels) usado para detectar imagens idênticas."""
+        return hashlib.sha1(str(pixels.shape).encode() + pixels.tobytes()).hexdigest()
+
+    @staticmethod
+    def hamming(hash_a: int, hash_b: int) -> int:
+        return bin(hash_a ^ hash_b).count("1")
+
+    def diff_mask(self, current: np.ndarray, baseline: np.ndarray, pixel_tolerance: int) -> np.ndarray:
+        """Retorna a máscara booleana dos pixels cuja diferença em algum canal excede a tolerância."""
+        delta = np.abs(current.astype(np.int16) - baseline.astype(np.int16))
+        return delta.max(axis=2) > pixel_tolerance
+
+    # -------------------------------------------------------------------------
+    # Persistência de baselines / diffs
+    # -------------------------------------------------------------------------
+    def _save_baseline(self, name: str, pixels: np.ndarray, image_hash: int, replace: Optional[dict] = None) -> Path:
+        self.baseline_dir.mkdir(parents=True, exist_ok=True)
+        file_name = f"{name}_{uuid.uuid4().hex[:8]}.png"
+        file_path = self.baseline_dir / file_name
+        Image.fromarray(pixels).save(file_path)
+
+        entry = {
+            "file": file_name,
+            "hash": f"{image_hash:016x}",
+            "digest": self.digest(pixels),
+            "shape": list(pixels.shape[:2]),
+        }
+
+        def mutate(index: Dict[str, List[dict]]):
+            entries = index.setdefault(name, [])
+            for position, item in enumerate(entries):
+                if replace is not None and item["file"] == replace["file"]:
+                    entries[position] = entry
+                    break
+            else:
+                entries.append(entry)
+
+        self._update_index(mutate)
+        if replace is not None:
+            (self.baseline_dir / replace["file"]).unlink(missing_ok=True)
+        return file_path
+
+    def _save_diff(self, name: str, current: np.ndarray, changed: Optional[np.ndarray]) -> Path:
+        dir_path = self.diff_dir / datetime.now().strftime("%Y-%m-%d")
+        dir_path.mkdir(parents=True, exist_ok=True)
+        unique = uuid.uuid4().hex[:8]
+        file_path = dir_path / f"visual_diff_{name}_{datetime.now().strftime('%H%M%S')}_{unique}.png"
+
+        overlay = current.copy()
+        if changed is not None:
+            overlay[changed] = (255, 0, 0)
+        Image.fromarray(overlay).save(file_path)
+        return file_path
+
+    # -------------------------------------------------------------------------
+    # API pública
+    # -------------------------------------------------------------------------
+    def check(
+        self,
+        image_bytes: bytes,
+        name: str,
+        masks: Sequence[Box] = (),
+        pixel_tolerance: Optional[int] = None,
+        max_diff_ratio: Optional[float] = None,
+    ) -> VisualCheckResult:
+        """Compara a imagem atual com o baseline mais próximo do checkpoint ``name``.
+
+        Args:
+            image_bytes: Screenshot PNG atual.
+            name: Identificador do checkpoint visual.
+            masks: Regiões ``(x, y, largura, altura)`` ignoradas na comparação.
+            pixel_tolerance: Diferença máxima por canal considerada igual.
+            max_diff_ratio: Fração máxima de pixels divergentes para aprovar.
+
+        Returns:
+            ``VisualCheckResult`` com o baseline usado e a métrica de diferença.
+        """
+        pixel_tolerance = self.pixel_tolerance if pixel_tolerance is None else pixel_tolerance
+        max_diff_ratio = self.max_diff_ratio if max_diff_ratio is None else max_diff_ratio
+        update_mode = os.getenv("UPDATE_BASELINES", "").lower()
+
+        raw = self.decode(image_bytes)
+        current = self.apply_masks(raw, masks)
+        current_hash = self.perceptual_hash(raw)
+        candidates = self._load_index().get(name) or self._load_index(refresh=True).get(name, [])
+
+        if not candidates or update_mode == "add":
+            path = self._save_baseline(name, raw, current_hash)
+            return VisualCheckResult(name=name, passed=True, baseline_path=path, created_baseline=True)
+
+        current_digest = self.digest(raw)
+        nearest = min(
+            candidates,
+            key=lambda entry: (
+                entry.get("digest") != current_digest,
+                self.hamming(current_hash, int(entry["hash"], 16)),
+            ),
+        )
+        distance = self.hamming(current_hash, int(nearest["hash"], 16))
+        baseline_path = self.baseline_dir / nearest["file"]
+        same_shape = list(current.shape[:2]) == nearest["shape"]
+
+        if nearest.get("digest") == current_digest:
+            return VisualCheckResult(name=name, passed=True, baseline_path=baseline_path, hash_distance=distance)
+
+        changed = None
+        if same_shape:
+            with Image.open(baseline_path) as image:
+                baseline = self.apply_masks(np.asarray(image.convert("RGB"), dtype=np.uint8), masks)
+            changed = self.diff_mask(current, baseline, pixel_tolerance)
+            diff_ratio = float(changed.mean())
+        else:
+            diff_ratio = 1.0
+
+        passed = diff_ratio <= max_diff_ratio
+        if not passed and update_mode == "1":
+            path = self._save_baseline(name, raw, current_hash, replace=nearest)
+            return VisualCheckResult(
+                name=name,
+                passed=True,
+                baseline_path=path,
+                hash_distance=distance,
+                diff_ratio=diff_ratio,
+                created_baseline=True,
+                full_diff=same_shape,
+            )
+
+        return VisualCheckResult(
+            name=name,
+            passed=passed,
+            baseline_path=baseline_path,
+            hash_distance=distance,
+            diff_ratio=diff_ratio,
+            diff_path=None if passed else self._save_diff(name, raw, changed),
+            full_diff=same_shape,
+        )
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from playwright.sync_api import BrowserContext, Page
+
+from util.metrics import percentile
+
+# Observers registrados antes de qualquer script da página (context.add_init_script),
+# com ``buffered: true`` para não perder entradas emitidas antes do registro.
+WEB_VITALS_INIT_SCRIPT = """
+(() => {
+    if (window.__webVitals) return;
+    const vitals = window.__webVitals = {
+        fcp: null, lcp: null, cls: 0, clsCursor: 0, longTasks: [], longTaskCursor: 0, navigationReported: false,
+    };
+    const observe = (type, callback) => {
+        try {
+            new PerformanceObserver((list) => list.getEntries().forEach(callback)).observe({type, buffered: true});
+        } catch (e) { /* tipo não suportado pelo navegador */ }
+    };
+    observe('paint', (entry) => {
+        if (entry.name === 'first-contentful-paint') vitals.fcp = entry.startTime;
+    });
+    observe('largest-contentful-paint', (entry) => { vitals.lcp = entry.startTime; });
+    observe('layout-shift', (entry) => { if (!entry.hadRecentInput) vitals.cls += entry.value; });
+    observe('longtask', (entry) => { vitals.longTasks.push(entry.duration); });
+})();
+"""
+
+# Navigation timing, FCP e LCP pertencem ao documento: são lidos apenas na primeira
+# leitura após o carregamento (uma navegação real, inclusive disparada por clique).
+# Enquanto ``loadEventEnd`` ainda é 0 o documento não terminou de carregar: a leitura
+# não marca a navegação como reportada e timings zerados viram null.
+# CLS e long tasks são sempre o delta desde a leitura anterior.
+_COLLECT_JS = """
+() => {
+    const vitals = window.__webVitals;
+    const nav = performance.getEntriesByType('navigation')[0];
+    const loaded = Boolean(nav && nav.loadEventEnd > 0);
+    const navigated = loaded && (!vitals || !vitals.navigationReported);
+    let longTasks = [];
+    let cls = null;
+    if (vitals) {
+        if (loaded) vitals.navigationReported = true;
+        longTasks = vitals.longTasks.slice(vitals.longTaskCursor);
+        vitals.longTaskCursor = vitals.longTasks.length;
+        cls = vitals.cls - vitals.clsCursor;
+        vitals.clsCursor = vitals.cls;
+    }
+    const documentTiming = (value) => (navigated && value > 0 ? value : null);
+    return {
+        navigated: navigated,
+        ttfb_ms: documentTiming(nav && nav.responseStart),
+        dom_content_loaded_ms: documentTiming(nav && nav.domContentLoadedEventEnd),
+        load_ms: documentTiming(nav && nav.loadEventEnd),
+        transfer_size: navigated && nav.transferSize !== undefined ? nav.transferSize : null,
+        fcp_ms: documentTiming(vitals && vitals.fcp),
+        lcp_ms: documentTiming(vitals && vitals.lcp),
+        cls: cls,
+        long_tasks: longTasks.length,
+        long_task_ms: longTasks.reduce((total, duration) => total + duration, 0),
+    };
+}
+"""
+
+TREND_METRICS = (
+    "ttfb_ms",
+    "dom_content_loaded_ms",
+    "load_ms",
+    "fcp_ms",
+    "lcp_ms",
+    "cls",
+    "long_task_ms",
+    "duration_ms",
+)
+TREND_RUNS = 20
+
+
+class WebVitalsCollector:
+    """Coleta navigation timing, FCP/LCP, CLS e long tasks a cada navegação/interação.
+
+    Opt-in via ``--perf-metrics``: o fixture ``page`` expõe a instância em
+    ``page.perf_collector`` e os helpers ``open`` e ``click`` de ``BasePage`` são
+    executados via ``timed``. Cada registro é uma linha em ``metrics.jsonl`` marcada com
+    teste, ambiente e Page Object; ``aggregate_trends`` gera os percentis por execução.
+
+    Navigation timing, FCP e LCP só são preenchidos no primeiro registro de cada
+    documento (``navigated``); interações sem navegação trazem apenas o delta de CLS,
+    as long tasks novas e a duração da ação.
+    """
+
+    def __init__(self, output_dir: str, run_id: str, tags: Dict[str, str]):
+        self.output_dir = Path(output_dir)
+        self.run_id = run_id
+        self.tags = tags
+
+    @staticmethod
+    def install(context: BrowserContext):
+        """Registra os PerformanceObservers em todas as páginas do contexto."""
+        context.add_init_script(WEB_VITALS_INIT_SCRIPT)
+
+    @property
+    def history_path(self) -> Path:
+        return self.output_dir / "metrics.jsonl"
+
+    def record(
+        self,
+        page: Page,
+        page_object: str,
+        event: str,
+        target: str,
+        duration_ms: Optional[float] = None,
+    ) -> Optional[dict]:
+        """Lê as métricas da página atual e anexa o registro ao histórico local.
+
+        Args:
+            page: Página Playwright monitorada.
+            page_object: Classe do Page Object que disparou a ação.
+            event: ``navigation`` (``open``) ou ``interaction`` (``click``).
+            target: URL navegada ou rótulo do elemento clicado.
+            duration_ms: Duração da ação medida pelo helper.
+        """
+        try:
+            metrics = page.evaluate(_COLLECT_JS)
+        except Exception:
+            return None
+        metrics["duration_ms"] = duration_ms
+
+        entry = {
+            "run_id": self.run_id,
+            "timestamp": datetime.now().isoformat(timespec="milliseconds"),
+            **self.tags,
+            "page_object": page_object,
+            "event": event,
+            "target": target,
+            "url": page.url,
+            "metrics": metrics,
+        }
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Uma única escrita por linha em modo append: seguro entre workers do xdist.
+        with self.history_path.open("a", encoding="utf-8") as history:
+            history.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return entry
+
+    def timed(self, page: Page, page_object: str, event: str, target: str, action) -> None:
+        """Executa ``action`` medindo sua duração e registra as métricas em seguida.
+
+        Se uma interação trocou o documento (ex.: clique em link), aguarda o ``load``
+        antes da leitura para não registrar timings ainda zerados da nova página.
+        """
+        url_before = page.url
+        started = time.perf_counter()
+        action()
+        duration_ms = (time.perf_counter() - started) * 1000
+        if event == "interaction" and page.url != url_before:
+            try:
+                page.wait_for_load_state()
+            except Exception:
+                pass
+        self.record(page, page_object, event, target, duration_ms=duration_ms)
+
+
+def _summarize(values: List[float]) -> dict:
+    return {
+        "samples": len(values),
+        "p50": percentile(values, 50),
+        "p75": percentile(values, 75),
+        "p95": percentile(values, 95),
+    }
+
+
+def aggregate_trends(output_dir: str = "reports/perf", max_runs: int = TREND_RUNS) -> Optional[Path]:
+    """Consolida ``metrics.jsonl`` em ``trends.json`` com percentis gerais e por execução.
+
+    Agrupa por ambiente, navegador, Page Object, tipo de evento e alvo; para cada métrica gera
+    p50/p75/p95 do histórico completo e o p75 das últimas ``max_runs`` execuções.
+    """
+    dir_path = Path(output_dir)
+    history_path = dir_path / "metrics.jsonl"
+    if not history_path.exists():
+        return None
+
+    groups: Dict[tuple, "OrderedDict[str, Dict[str, List[float]]]"] = {}
+    with history_path.open(encoding="utf-8") as history:
+        for line in history:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            key = (
+                entry.get("env"),
+                entry.get("browser"),
+                entry.get("page_object"),
+                entry.get("event"),
+                entry.get("target"),
+            )
+            runs = groups.setdefault(key, OrderedDict())
+            run_metrics = runs.setdefault(entry.get("run_id"), {})
+            for metric in TREND_METRICS:
+                value = entry.get("metrics", {}).get(metric)
+                if value is not None:
+                    run_metrics.setdefault(metric, []).append(value)
+
+    report = []
+    for (env, browser, page_object, event, target), runs in groups.items():
+        overall: Dict[str, List[float]] = {}
+        for run_metrics in runs.values():
+            for metric, values in run_metrics.items():
+                overall.setdefault(metric, []).extend(values)
+        report.append({
+            "env": env,
+            "browser": browser,
+            "page_object": page_object,
+            "event": event,
+            "target": target,
+            "overall": {metric: _summarize(values) for metric, values in overall.items()},
+            "trend_p75": [
+                {"run_id": run_id, **{metric: percentile(values, 75) for metric, values in run_metrics.items()}}
+                for run_id, run_metrics in list(runs.items())[-max_runs:]
+            ],
+        })
+
+    trends_path = dir_path / "trends.json"
+    trends_path.write_text(
+        json.dumps(
+            {"generated_at": datetime.now().isoformat(timespec="seconds"), "groups": report},
+            indent=2,
+            ensure_ascii=False,
+        ),
+        encoding="utf-8",
+    )
+    return trends_path
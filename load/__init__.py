@@ -0,0 +1,4 @@
+from load.journeys import JOURNEYS
+from load.runner import LoadConfig, LoadRunner
+
+__all__ = ["JOURNEYS", "LoadConfig", "LoadRunner"]
@@ -0,0 +1,3 @@
+from load.runner import main
+
+main()
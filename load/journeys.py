@@ -0,0 +1,49 @@
+from typing import Callable, Dict, Iterator, Tuple
+
+from playwright.sync_api import Page
+
+from pages.create_account_page import CreateAccountPage
+from pages.login_page import LoginPage
+from util.user_builder import UserBuilder
+
+Step = Tuple[str, Callable[[], None]]
+Journey = Callable[[Page, str], Iterator[Step]]
+
+TEXTO_CONFIRMACAO = "Confirme algumas informações antes de criar uma conta"
+
+
+def jornada_criar_conta(page: Page, base_url: str) -> Iterator[Step]:
+    """Mesmo fluxo de ``test_created_account_sucesso`` dividido em passos medidos.
+
+    Cada ``yield`` devolve o nome do passo e a ação correspondente; o runner mede a
+    latência da ação e aplica o think time antes de pedir o próximo passo.
+    """
+    user = UserBuilder.build(genero="Homem")
+    login_page = LoginPage(page)
+    created_account_page = CreateAccountPage(page)
+
+    yield "abrir_login", lambda: login_page.abrir(base_url)
+    yield "criar_conta", login_page.criar_conta
+    yield "nome_sobrenome", lambda: created_account_page.inserir_nome_sobrenome(user.nome, user.sobrenome)
+    yield "infos_basicas", lambda: created_account_page.inserir_infos_basicas(
+        user.dia, user.mes, user.ano, user.genero
+    )
+    yield "username", lambda: created_account_page.inserir_username(user.email)
+    yield "senha", lambda: created_account_page.inserir_senha(user.senha)
+    yield "confirmacao", lambda: created_account_page.expect_text(
+        created_account_page.confirme_informacoes_text, TEXTO_CONFIRMACAO
+    )
+
+
+def jornada_abrir_login(page: Page, base_url: str) -> Iterator[Step]:
+    """Jornada curta (home + login) útil como sonda leve de disponibilidade."""
+    login_page = LoginPage(page)
+
+    yield "abrir_login", lambda: login_page.abrir(base_url)
+    yield "criar_conta", login_page.criar_conta
+
+
+JOURNEYS: Dict[str, Journey] = {
+    "criar_conta": jornada_criar_conta,
+    "abrir_login": jornada_abrir_login,
+}
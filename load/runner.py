@@ -0,0 +1,319 @@
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from playwright.sync_api import BrowserContext, sync_playwright
+
+from load.journeys import JOURNEYS, Step
+from util.metrics import LatencyHistogram
+
+MAX_ERROR_SAMPLES = 20
+SESSION_STEP = "nova_sessao"  # criação do BrowserContext/página de cada iteração
+
+
+@dataclass
+class LoadConfig:
+    """Parâmetros de uma execução de carga sintética."""
+
+    base_url: str
+    journey: str = "criar_conta"
+    users: int = 10
+    browsers: Optional[int] = None  # None: um navegador por usuário (todos concorrentes)
+    ramp_up_s: float = 10.0
+    think_time_ms: int = 1000
+    iterations: int = 1
+    duration_s: Optional[float] = None
+    browser_type: str = "chromium"
+    headless: bool = True
+    output_dir: str = "reports/load"
+
+
+@dataclass
+class _VirtualUser:
+    vu_id: int
+    ready_at: float
+    iterations_done: int = 0
+    context: Optional[BrowserContext] = None
+    steps: Optional[Iterator[Step]] = None
+    iteration_started_at: float = 0.0
+
+
+@dataclass
+class LoadStats:
+    """Métricas acumuladas por thread de navegador e consolidadas ao final."""
+
+    steps: Dict[str, LatencyHistogram] = field(default_factory=dict)
+    step_errors: Dict[str, int] = field(default_factory=dict)
+    iterations: LatencyHistogram = field(default_factory=LatencyHistogram)
+    iterations_failed: int = 0
+    error_samples: List[str] = field(default_factory=list)
+    fatal_error: Optional[str] = None
+
+    def record_step(self, name: str, elapsed_ms: float):
+        self.steps.setdefault(name, LatencyHistogram()).record(elapsed_ms)
+
+    def record_error(self, vu_id: int, name: str, exc: Exception):
+        self.step_errors[name] = self.step_errors.get(name, 0) + 1
+        self.iterations_failed += 1
+        if len(self.error_samples) < MAX_ERROR_SAMPLES:
+            self.error_samples.append(f"vu={vu_id} step={name}: {type(exc).__name__}: {exc}".splitlines()[0])
+
+    def merge(self, other: "LoadStats"):
+        for name, histogram in other.steps.items():
+            self.steps.setdefault(name, LatencyHistogram()).merge(histogram)
+        for name, count in other.step_errors.items():
+            self.step_errors[name] = self.step_errors.get(name, 0) + count
+        self.iterations.merge(other.iterations)
+        self.iterations_failed += other.iterations_failed
+        if other.fatal_error:
+            self.error_samples.append(f"browser: {other.fatal_error}")
+        self.error_samples.extend(other.error_samples[: max(0, MAX_ERROR_SAMPLES - len(self.error_samples))])
+
+
+class LoadRunner:
+    """Executa N usuários virtuais reaproveitando os Page Objects dos testes funcionais.
+
+    Cada thread controla um navegador próprio (a API síncrona do Playwright, usada
+    pelos Page Objects, não pode ser compartilhada entre threads) e hospeda um ou mais
+    usuários virtuais, cada um com seu ``BrowserContext``.
+
+    A concorrência real é o número de navegadores: no máximo ``browsers`` ações em
+    andamento ao mesmo tempo. Por padrão há um navegador por usuário, então os
+    ``users`` usuários são de fato simultâneos. Com ``browsers < users`` os usuários de
+    um mesmo navegador se alternam passo a passo durante o think time (mais sessões
+    abertas do que ações em paralelo) e um passo lento atrasa os demais daquela thread.
+    """
+
+    def __init__(self, config: LoadConfig):
+        if config.journey not in JOURNEYS:
+            raise ValueError(f"Jornada '{config.journey}' não suportada. Use uma de: {', '.join(JOURNEYS)}.")
+        self.config = config
+        self.journey = JOURNEYS[config.journey]
+
+    @property
+    def concurrency(self) -> int:
+        """Máximo de ações simultâneas: um navegador (thread) por usuário, salvo ``browsers`` menor."""
+        return max(1, min(self.config.browsers or self.config.users, self.config.users))
+
+    def _think_time(self) -> float:
+        """Think time em segundos com jitter de ±50% para evitar sincronismo entre usuários."""
+        return self.config.think_time_ms * random.uniform(0.5, 1.5) / 1000
+
+    def _finish_iteration(self, vu: _VirtualUser, stats: LoadStats, succeeded: bool):
+        if succeeded:
+            stats.iterations.record((time.perf_counter() - vu.iteration_started_at) * 1000)
+        if vu.context is not None:
+            try:
+                vu.context.close()
+            except Exception:
+                pass
+        vu.context = None
+        vu.steps = None
+        vu.iterations_done += 1
+        vu.ready_at = time.perf_counter() + self._think_time()
+
+    def _has_more_iterations(self, vu: _VirtualUser, deadline: Optional[float]) -> bool:
+        if deadline is not None:
+            return time.perf_counter() < deadline
+        return vu.iterations_done < self.config.iterations
+
+    def _run_browser(self, users: List[_VirtualUser], deadline: Optional[float], stats: LoadStats):
+        try:
+            self._drive_users(users, deadline, stats)
+        except Exception as exc:  # ex.: navegador Playwright ausente
+            stats.fatal_error = f"{type(exc).__name__}: {exc}".splitlines()[0]
+
+    def _drive_users(self, users: List[_VirtualUser], deadline: Optional[float], stats: LoadStats):
+        config = self.config
+        with sync_playwright() as playwright:
+            browser = getattr(playwright, config.browser_type).launch(headless=config.headless)
+            pending = list(users)
+            try:
+                while pending:
+                    vu = min(pending, key=lambda user: user.ready_at)
+                    if vu.steps is None and not self._has_more_iterations(vu, deadline):
+                        pending.remove(vu)
+                        continue
+
+                    delay = vu.ready_at - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+
+                    if vu.steps is None:
+                        vu.iteration_started_at = time.perf_counter()
+                        try:
+                            vu.context = browser.new_context(base_url=config.base_url)
+                            vu.steps = self.journey(vu.context.new_page(), config.base_url)
+                        except Exception as exc:
+                            # Falha ao abrir a sessão conta como iteração falha, não derruba o navegador.
+                            stats.record_error(vu.vu_id, SESSION_STEP, exc)
+                            self._finish_iteration(vu, stats, succeeded=False)
+                            continue
+
+                    try:
+                        name, action = next(vu.steps)
+                    except StopIteration:
+                        self._finish_iteration(vu, stats, succeeded=True)
+                        continue
+
+                    started = time.perf_counter()
+                    try:
+                        action()
+                    except Exception as exc:
+                        stats.record_error(vu.vu_id, name, exc)
+                        self._finish_iteration(vu, stats, succeeded=False)
+                        continue
+                    stats.record_step(name, (time.perf_counter() - started) * 1000)
+                    vu.ready_at = time.perf_counter() + self._think_time()
+            finally:
+                for vu in users:
+                    if vu.context is not None:
+                        try:
+                            vu.context.close()
+                        except Exception:
+                            pass
+                browser.close()
+
+    def run(self) -> dict:
+        """Dispara os usuários virtuais com ramp-up linear e retorna o resumo consolidado."""
+        config = self.config
+        browsers = self.concurrency
+        started = time.perf_counter()
+        deadline = started + config.ramp_up_s + config.duration_s if config.duration_s else None
+
+        groups: List[List[_VirtualUser]] = [[] for _ in range(browsers)]
+        for index in range(config.users):
+            ready_at = started + config.ramp_up_s * index / config.users
+            groups[index % browsers].append(_VirtualUser(vu_id=index, ready_at=ready_at))
+
+        per_thread = [LoadStats() for _ in groups]
+        threads = [
+            threading.Thread(
+                target=self._run_browser,
+                args=(group, deadline, thread_stats),
+                name=f"load-browser-{index}",
+                daemon=True,
+            )
+            for index, (group, thread_stats) in enumerate(zip(groups, per_thread))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        fatal_errors = [thread_stats.fatal_error for thread_stats in per_thread if thread_stats.fatal_error]
+        if len(fatal_errors) == len(per_thread):
+            raise RuntimeError(f"Nenhum navegador pôde executar a carga: {fatal_errors[0]}")
+
+        elapsed_s = time.perf_counter() - started
+        stats = LoadStats()
+        for thread_stats in per_thread:
+            stats.merge(thread_stats)
+        return self._summary(stats, elapsed_s)
+
+    def _summary(self, stats: LoadStats, elapsed_s: float) -> dict:
+        steps_total = sum(histogram.count for histogram in stats.steps.values())
+        return {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "config": asdict(self.config),
+            "elapsed_s": round(elapsed_s, 3),
+            "max_concurrent_actions": self.concurrency,
+            "iterations_ok": stats.iterations.count,
+            "iterations_failed": stats.iterations_failed,
+            "throughput": {
+                "iterations_per_s": stats.iterations.count / elapsed_s if elapsed_s else 0.0,
+                "steps_per_s": steps_total / elapsed_s if elapsed_s else 0.0,
+            },
+            "iteration_latency": stats.iterations.to_dict(),
+            "steps": {
+                name: {**histogram.to_dict(), "errors": stats.step_errors.get(name, 0)}
+                for name, histogram in stats.steps.items()
+            },
+            "step_errors": stats.step_errors,
+            "error_samples": stats.error_samples,
+        }
+
+    def export(self, summary: dict) -> Path:
+        """Grava o resumo em ``output_dir`` com nome único por execução."""
+        dir_path = Path(self.config.output_dir)
+        dir_path.mkdir(parents=True, exist_ok=True)
+        file_path = dir_path / f"load_{self.config.journey}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        file_path.write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
+        return file_path
+
+
+def _format_ms(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.0f}"
+
+
+def print_summary(summary: dict):
+    print(
+        f"\nIterações: {summary['iterations_ok']} ok / {summary['iterations_failed']} falhas "
+        f"em {summary['elapsed_s']:.1f}s "
+        f"({summary['throughput']['iterations_per_s']:.2f} it/s, "
+        f"{summary['throughput']['steps_per_s']:.2f} passos/s)"
+    )
+    print(f"{'passo':<20}{'n':>7}{'erros':>7}{'p50':>9}{'p90':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for name, data in summary["steps"].items():
+        print(
+            f"{name:<20}{data['count']:>7}{data['errors']:>7}"
+            f"{_format_ms(data['p50_ms']):>9}{_format_ms(data['p90_ms']):>9}"
+            f"{_format_ms(data['p95_ms']):>9}{_format_ms(data['p99_ms']):>9}{_format_ms(data['max_ms']):>9}"
+        )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Carga sintética no front-end reutilizando os Page Objects como usuários virtuais."
+    )
+    parser.add_argument("--base-url", required=True, help="URL alvo (ex.: stand-in local http://localhost:8000).")
+    parser.add_argument("--journey", default="criar_conta", choices=sorted(JOURNEYS), help="Jornada executada.")
+    parser.add_argument("--users", type=int, default=10, help="Usuários virtuais simultâneos.")
+    parser.add_argument(
+        "--browsers",
+        type=int,
+        default=None,
+        help="Navegadores (threads) que hospedam os usuários; define quantas ações rodam em paralelo. "
+        "Padrão: um por usuário.",
+    )
+    parser.add_argument("--ramp-up", type=float, default=10.0, help="Segundos até todos os usuários iniciarem.")
+    parser.add_argument("--think-time", type=int, default=1000, help="Think time médio entre passos (ms).")
+    parser.add_argument("--iterations", type=int, default=1, help="Iterações por usuário (ignorado com --duration).")
+    parser.add_argument("--duration", type=float, default=None, help="Duração em segundos após o ramp-up.")
+    parser.add_argument("--browser-type", default="chromium", choices=["chromium", "firefox", "webkit"])
+    parser.add_argument("--output-dir", default="reports/load", help="Diretório do resumo JSON.")
+    args = parser.parse_args(argv)
+
+    config = LoadConfig(
+        base_url=args.base_url,
+        journey=args.journey,
+        users=args.users,
+        browsers=args.browsers,
+        ramp_up_s=args.ramp_up,
+        think_time_ms=args.think_time,
+        iterations=args.iterations,
+        duration_s=args.duration,
+        browser_type=args.browser_type,
+        headless=os.getenv("HEADLESS", "true").lower() != "false",
+        output_dir=args.output_dir,
+    )
+    runner = LoadRunner(config)
+    if runner.concurrency < config.users:
+        print(
+            f"Aviso: {config.users} usuários em {runner.concurrency} navegadores; no máximo "
+            f"{runner.concurrency} ações simultâneas (os demais usuários aguardam a vez na mesma thread)."
+        )
+    summary = runner.run()
+    print_summary(summary)
+    print(f"\nResumo exportado em {runner.export(summary)}")
+
+
+if __name__ == "__main__":
+    main()
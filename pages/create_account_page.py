@@ -1,22 +1,30 @@
-from typing import Optional
-
-from playwright.sync_api import Page
+from typing import TYPE_CHECKING, Optional
 
 from core.base_page import BasePage
 from core.screenshot_service import ScreenshotService
+from core.visual_regression_service import VisualRegressionService
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Page
 
 
 class CreateAccountPage(BasePage):
     """Modela o fluxo de criação de conta do Google."""
 
-    def __init__(self, page: Page, screenshot_service: Optional[ScreenshotService] = None):
+    def __init__(
+            self,
+            page: "Page",
+            screenshot_service: Optional[ScreenshotService] = None,
+            visual_service: Optional[VisualRegressionService] = None,
+    ):
         """Inicializa a página de criação de conta e resolve os seletores principais.
 
         Args:
             page: Instância sincronizada do Playwright utilizada na navegação.
             screenshot_service: Serviço opcional para evidências em falhas.
+            visual_service: Serviço opcional de regressão visual.
         """
-        super().__init__(page, screenshot_service)
+        super().__init__(page, screenshot_service, visual_service)
         self.nome_input = page.get_by_label("Nome", exact=True)
         self.sobrenome_input = page.locator("input[id='lastName']")
         self.avancar_button = page.get_by_role("button", name="Avançar")
@@ -55,9 +63,9 @@ class CreateAccountPage(BasePage):
         locator_genero = f"//ul[@role='listbox' and @aria-label='Gênero']//li[.//span[normalize-space()='{genero}']]"
 
         self.fill(self.dia_input, dia)
-        self.click_and_select(self.mes_box, option_locator=locator_mes)
+        self.click_and_select(self.mes_box, option_locator=locator_mes, option_label="mes_option")
         self.fill(self.ano_input, ano)
-        self.click_and_select(self.genero_box, option_locator=locator_genero)
+        self.click_and_select(self.genero_box, option_locator=locator_genero, option_label="genero_option")
         self.click(self.avancar_button)
 
     def inserir_username(self, username: str):
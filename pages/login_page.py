@@ -1,20 +1,29 @@
-from typing import Optional
-from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
+from typing import TYPE_CHECKING, Optional
 from core.base_page import BasePage
 from core.screenshot_service import ScreenshotService
+from core.visual_regression_service import VisualRegressionService
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Page
 
 
 class LoginPage(BasePage):
     """Modela a tela de autenticação com seletores centrais reutilizáveis."""
 
-    def __init__(self, page: Page, screenshot_service: Optional[ScreenshotService] = None):
+    def __init__(
+            self,
+            page: "Page",
+            screenshot_service: Optional[ScreenshotService] = None,
+            visual_service: Optional[VisualRegressionService] = None,
+    ):
         """Inicializa a página de login e resolve os seletores reutilizados nos cenários.
 
         Args:
             page: Instância sincronizada do Playwright utilizada na navegação.
             screenshot_service: Serviço opcional para evidências em falhas.
+            visual_service: Serviço opcional de regressão visual.
         """
-        super().__init__(page, screenshot_service)
+        super().__init__(page, screenshot_service, visual_service)
         self.fazer_login_click = page.locator("//a[@aria-label='Fazer login']")
         self.usuario_input = page.get_by_role("textbox", name="E-mail ou telefone")
         self.avancar_button = page.get_by_role("button", name="Avançar")
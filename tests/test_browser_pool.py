@@ -0,0 +1,53 @@
+from types import SimpleNamespace
+
+import pytest
+from playwright.sync_api import Error
+
+from core.browser_pool import BrowserPool, BrowserUnavailable, interleave, parse_engines
+
+
+class _FakeBrowserType:
+    def __init__(self, name, available=True):
+        self.name = name
+        self.available = available
+        self.launches = 0
+
+    def launch(self, headless=True):
+        self.launches += 1
+        if not self.available:
+            raise Error(f"BrowserType.launch: Executable doesn't exist for {self.name}")
+        return SimpleNamespace(name=self.name, close=lambda: None)
+
+
+def test_parse_engines_valida_e_remove_repeticoes():
+    assert parse_engines(" chromium, Firefox ,chromium") == ["chromium", "firefox"]
+    with pytest.raises(ValueError):
+        parse_engines("chromium,safari")
+    with pytest.raises(ValueError):
+        parse_engines(" , ")
+
+
+def test_interleave_alterna_engines_preservando_ordem():
+    groups = [["c1", "c2", "c3"], ["f1"], ["w1", "w2"]]
+
+    assert interleave(groups) == ["c1", "f1", "w1", "c2", "w2", "c3"]
+
+
+def test_pool_inicia_cada_engine_uma_vez_sob_demanda():
+    playwright = SimpleNamespace(chromium=_FakeBrowserType("chromium"), firefox=_FakeBrowserType("firefox"))
+    pool = BrowserPool(playwright)
+
+    assert pool.browsers == {}
+    assert pool.get("chromium") is pool.get("chromium")
+    assert playwright.chromium.launches == 1
+    assert playwright.firefox.launches == 0
+
+
+def test_pool_memoriza_engine_indisponivel():
+    playwright = SimpleNamespace(webkit=_FakeBrowserType("webkit", available=False))
+    pool = BrowserPool(playwright)
+
+    for _ in range(3):
+        with pytest.raises(BrowserUnavailable, match="playwright install webkit"):
+            pool.get("webkit")
+    assert playwright.webkit.launches == 1
@@ -1,12 +1,11 @@
+import pytest
+
 from pages.create_account_page import CreateAccountPage
 from pages.login_page import LoginPage
-from util.user_builder import UserBuilder
+from util.user_builder import UserBuilder, UserData
 
 
-def test_created_account_sucesso(page, screenshot_service, base_url):
-    # Dados dinâmicos do usuário
-    user = UserBuilder.build(genero="Homem")
-
+def _criar_conta(page, screenshot_service, base_url, user: UserData):
     # Dado que eu esteja na tela de Criação de Conta
     login_page = LoginPage(page, screenshot_service)
     login_page.abrir(base_url)
@@ -22,3 +21,18 @@ def test_created_account_sucesso(page, screenshot_service, base_url):
     # Então exibe o QRCODE para finalizar o processo pelo celular
     texto_confirmacao = 'Confirme algumas informações antes de criar uma conta'
     created_account_page.expect_text(created_account_page.confirme_informacoes_text, texto_confirmacao)
+
+
+def test_created_account_sucesso(page, screenshot_service, base_url):
+    # Dados dinâmicos do usuário
+    user = UserBuilder.build(genero="Homem")
+
+    _criar_conta(page, screenshot_service, base_url, user)
+
+
+@pytest.mark.dataset("tests/data/usuarios.jsonl")
+def test_created_account_dataset(page, screenshot_service, base_url, data_row):
+    # Dados do usuário lidos sob demanda da linha do dataset
+    user = UserBuilder.from_row(data_row)
+
+    _criar_conta(page, screenshot_service, base_url, user)
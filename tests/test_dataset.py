@@ -0,0 +1,51 @@
+import json
+
+from util.dataset import DatasetIndex
+
+
+def _jsonl(tmp_path, total=50):
+    path = tmp_path / "usuarios.jsonl"
+    linhas = [json.dumps({"nome": f"user{n}", "genero": "Homem" if n % 2 else "Mulher"}) for n in range(total)]
+    path.write_text("\n".join(linhas) + "\n\n", encoding="utf-8")
+    return path
+
+
+def test_indice_jsonl_le_linhas_sob_demanda(tmp_path):
+    index = DatasetIndex(str(_jsonl(tmp_path)), cache_dir=str(tmp_path / "cache"))
+
+    assert len(index) == 50
+    assert index.read(index.offsets[37]) == {"nome": "user37", "genero": "Homem"}
+
+
+def test_indice_csv_usa_cabecalho(tmp_path):
+    path = tmp_path / "usuarios.csv"
+    path.write_text("nome,mes\nAna,Março\n\"Silva, Bruno\",Julho\n", encoding="utf-8")
+
+    index = DatasetIndex(str(path), cache_dir=None)
+
+    assert len(index) == 2
+    assert index.read(index.offsets[1]) == {"nome": "Silva, Bruno", "mes": "Julho"}
+
+
+def test_indice_reaproveita_cache(tmp_path):
+    path = _jsonl(tmp_path)
+    DatasetIndex(str(path), cache_dir=str(tmp_path / "cache"))
+
+    cached = DatasetIndex(str(path), cache_dir=str(tmp_path / "cache"))
+
+    assert len(list((tmp_path / "cache").glob("*.idx"))) == 1
+    assert len(cached) == 50
+    assert cached.read(cached.offsets[0])["nome"] == "user0"
+
+
+def test_selecao_por_fatia_filtro_e_amostra_deterministica(tmp_path):
+    index = DatasetIndex(str(_jsonl(tmp_path)), cache_dir=None)
+
+    fatia = index.select(rows="10:20")
+    homens = index.select(where={"genero": "Homem"})
+    amostra = index.select(sample=5, seed=7)
+
+    assert [ref.number for ref in fatia] == list(range(10, 20))
+    assert len(homens) == 25 and all(ref.number % 2 for ref in homens)
+    assert amostra == index.select(sample=5, seed=7)
+    assert len(amostra) == 5 and repr(amostra[0]).startswith("row")
@@ -0,0 +1,82 @@
+import threading
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import load.runner
+from load.runner import MAX_ERROR_SAMPLES, SESSION_STEP, LoadConfig, LoadRunner, LoadStats
+
+
+def test_merge_nao_excede_amostras_de_erro_apos_erro_fatal():
+    consolidado = LoadStats(error_samples=[f"erro {index}" for index in range(MAX_ERROR_SAMPLES)])
+    thread = LoadStats(fatal_error="Error: navegador ausente", error_samples=["outro erro"] * 10)
+
+    consolidado.merge(thread)
+
+    assert len(consolidado.error_samples) == MAX_ERROR_SAMPLES + 1
+    assert consolidado.error_samples[-1] == "browser: Error: navegador ausente"
+
+
+def test_concorrencia_padrao_e_um_navegador_por_usuario():
+    assert LoadRunner(LoadConfig(base_url="http://localhost", users=20)).concurrency == 20
+    assert LoadRunner(LoadConfig(base_url="http://localhost", users=20, browsers=4)).concurrency == 4
+    assert LoadRunner(LoadConfig(base_url="http://localhost", users=2, browsers=8)).concurrency == 2
+
+
+class _NavegadorFake:
+    """Browser/contexts em memória; a chamada ``falha_contexto`` de ``new_context`` levanta erro."""
+
+    def __init__(self, falha_contexto: int):
+        self.falha_contexto = falha_contexto
+        self.lock = threading.Lock()
+        self.chamadas = 0
+        self.contextos = []
+        self.fechamentos = 0
+
+    def launch(self, headless=True):
+        return SimpleNamespace(new_context=self.new_context, close=self.close)
+
+    def new_context(self, base_url=None):
+        with self.lock:
+            self.chamadas += 1
+            if self.chamadas == self.falha_contexto:
+                raise RuntimeError("Target page, context or browser has been closed")
+            contexto = SimpleNamespace(closed=False, new_page=lambda: SimpleNamespace(url=base_url))
+            contexto.close = lambda: setattr(contexto, "closed", True)
+            self.contextos.append(contexto)
+            return contexto
+
+    def close(self):
+        with self.lock:
+            self.fechamentos += 1
+
+
+def test_runner_executa_jornada_e_fecha_contextos(monkeypatch):
+    navegador = _NavegadorFake(falha_contexto=2)
+    jornadas = []
+
+    @contextmanager
+    def sync_playwright_fake():
+        yield SimpleNamespace(chromium=navegador)
+
+    def jornada(page, base_url):
+        with navegador.lock:
+            jornadas.append(page)
+            falha = len(jornadas) == 3
+        yield "abrir", lambda: None
+        yield "enviar", (lambda: 1 / 0) if falha else (lambda: None)
+
+    monkeypatch.setattr(load.runner, "sync_playwright", sync_playwright_fake)
+    runner = LoadRunner(
+        LoadConfig(base_url="http://localhost", users=3, browsers=2, ramp_up_s=0, think_time_ms=0, iterations=2)
+    )
+    runner.journey = jornada
+
+    summary = runner.run()
+
+    assert (summary["iterations_ok"], summary["iterations_failed"]) == (4, 2)
+    assert summary["step_errors"] == {SESSION_STEP: 1, "enviar": 1}
+    assert summary["steps"]["abrir"]["count"] == 5
+    assert summary["steps"]["enviar"]["count"] == 4
+    assert len(navegador.contextos) == 5
+    assert all(contexto.closed for contexto in navegador.contextos)
+    assert navegador.fechamentos == 2
@@ -0,0 +1,31 @@
+from util.metrics import LatencyHistogram
+
+
+def test_histograma_percentis_dentro_da_precisao():
+    histogram = LatencyHistogram(precision=0.05)
+    for value in range(1, 1001):
+        histogram.record(float(value))
+
+    assert histogram.count == 1000
+    assert abs(histogram.percentile(50) - 500) <= 500 * 0.05
+    assert abs(histogram.percentile(99) - 990) <= 990 * 0.05
+    assert histogram.percentile(100) == 1000
+
+
+def test_histograma_merge_consolida_threads():
+    rapido, lento = LatencyHistogram(), LatencyHistogram()
+    for _ in range(90):
+        rapido.record(10.0)
+    for _ in range(10):
+        lento.record(2000.0)
+
+    rapido.merge(lento)
+
+    assert rapido.count == 100
+    assert rapido.min == 10.0 and rapido.max == 2000.0
+    assert rapido.percentile(50) <= 10.5
+    assert rapido.percentile(95) >= 1900
+
+
+def test_histograma_vazio_nao_tem_percentis():
+    assert LatencyHistogram().percentile(99) is None
@@ -0,0 +1,87 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from core.run_history import RunHistory, main
+
+NODEID = "tests/test_created_account.py::test_created_account"
+
+
+def _report(nodeid, when, outcome="passed", duration=0.1, worker="gw0", **properties):
+    return SimpleNamespace(
+        nodeid=nodeid,
+        when=when,
+        duration=duration,
+        failed=outcome == "failed",
+        skipped=outcome == "skipped",
+        longreprtext="    assert False\nE   AssertionError: conta não criada" if outcome == "failed" else "",
+        user_properties=[("worker", worker), *properties.items()],
+    )
+
+
+def _run(history, run_id, tests):
+    history.start_run(run_id, env="dev", workers=2)
+    for nodeid, outcome, duration, properties in tests:
+        history.add_report(_report(nodeid, "setup", duration=0.05))
+        history.add_report(_report(nodeid, "call", outcome, duration, **properties))
+        history.add_report(_report(nodeid, "teardown", duration=0.01))
+    history.finish_run(0)
+
+
+def test_historico_consolida_fases_e_evidencias(tmp_path):
+    history = RunHistory(str(tmp_path / "history.sqlite3"))
+    evidence = {"evidence:screenshot": "evidencias/x.png", "evidence:trace": "evidencias/x.zip"}
+    _run(history, "run1", [(NODEID, "failed", 2.5, evidence)])
+
+    [latest] = history.artifacts("test_created_account")
+    assert latest["outcome"] == "failed"
+    assert latest["worker"] == "gw0"
+    assert latest["message"] == "AssertionError: conta não criada"
+    assert latest["evidence"] == {"screenshot": "evidencias/x.png", "trace": "evidencias/x.zip"}
+
+    run = history.connection.execute("SELECT failed, passed FROM runs WHERE run_id = 'run1'").fetchone()
+    assert tuple(run) == (1, 0)
+    history.close()
+
+
+def test_historico_identifica_instaveis_e_lentos(tmp_path):
+    history = RunHistory(str(tmp_path / "history.sqlite3"))
+    _run(history, "run1", [(NODEID, "passed", 3.0, {}), ("tests/test_a.py::test_rapido", "passed", 0.1, {})])
+    _run(history, "run2", [(NODEID, "failed", 4.0, {}), ("tests/test_a.py::test_rapido", "passed", 0.1, {})])
+
+    flaky = history.flaky()
+    assert [row["nodeid"] for row in flaky] == [NODEID]
+    assert (flaky[0]["passed"], flaky[0]["failed"]) == (1, 1)
+
+    slowest = history.slowest(limit=1)
+    assert slowest[0]["nodeid"] == NODEID
+    assert slowest[0]["avg_duration_s"] == pytest.approx(3.5)
+    assert history.average_durations()[NODEID] == pytest.approx(3.56)
+    history.close()
+
+
+def test_cli_artifacts_lista_evidencias_do_teste(tmp_path, capsys):
+    db_path = str(tmp_path / "history.sqlite3")
+    history = RunHistory(db_path)
+    _run(history, "run1", [(NODEID, "failed", 1.0, {"evidence:console": "evidencias/x.log"})])
+    history.close()
+
+    main(["--db", db_path, "artifacts", NODEID])
+
+    output = capsys.readouterr().out
+    assert "evidencias/x.log" in output
+    assert "gw0" in output
+
+
+def test_cli_aceita_opcoes_apos_o_subcomando(tmp_path, capsys):
+    db_path = str(tmp_path / "history.sqlite3")
+    history = RunHistory(db_path)
+    _run(history, "run1", [(NODEID, "passed", 1.0, {})])
+    history.close()
+
+    main(["slowest", "--db", db_path, "--json"])
+    assert json.loads(capsys.readouterr().out)[0]["nodeid"] == NODEID
+
+    main(["--json", "--db", db_path, "flaky"])
+    assert json.loads(capsys.readouterr().out) == []
@@ -0,0 +1,121 @@
+from types import SimpleNamespace
+
+import pytest
+
+from core.base_page import BasePage
+from core.selector_profiler import SelectorProfiler, SelectorStats, is_xpath, selector_of
+
+
+class _LocatorFake:
+    def __init__(self, selector: str):
+        self.selector = selector
+
+    def __repr__(self) -> str:
+        return f"<Locator frame=<Frame name= url='about:blank'> selector={self.selector!r}>"
+
+
+def test_selector_of_extrai_xpath_com_aspas_simples():
+    xpath = "//div[@role='combobox'][.//span[normalize-space()='Gênero']]"
+
+    assert selector_of(_LocatorFake(xpath)) == xpath
+    assert is_xpath(xpath)
+
+
+def test_seletores_css_e_role_nao_sao_xpath():
+    assert not is_xpath("input[id='lastName']")
+    assert not is_xpath('internal:role=button[name="Avançar"i]')
+    assert is_xpath("#form >> //li[.//span[text()='Para uso pessoal']]")
+
+
+def test_flags_de_seletor_lento_e_ambiguo():
+    stats = SelectorStats("CreateAccountPage", "genero_box", "//div[@role='combobox']")
+    stats.samples_ms.extend([40.0, 60.0])
+    stats.match_counts.extend([1, 3])
+
+    assert stats.flags(slow_threshold_ms=25.0) == ["slow", "ambiguous", "xpath"]
+
+
+class _LocatorRenderizadoAposEspera(_LocatorFake):
+    """Elemento que só aparece no DOM depois da espera (ex.: lista aberta por um clique)."""
+
+    def __init__(self, selector: str, renders: bool = True):
+        super().__init__(selector)
+        self.renders = renders
+        self.rendered = False
+
+    def wait_for(self, state, timeout):
+        if not self.renders:
+            raise TimeoutError(f"timeout {timeout}ms aguardando {state}")
+        self.rendered = True
+
+    def count(self):
+        return 1 if self.rendered else 0
+
+
+class _PaginaPerfilada(BasePage):
+    def __init__(self, profiler):
+        super().__init__(SimpleNamespace(selector_profiler=profiler))
+        self.opcao = _LocatorRenderizadoAposEspera("#opcao")
+        self.opcao_ausente = _LocatorRenderizadoAposEspera("#ausente", renders=False)
+
+
+def test_perfil_mede_seletor_apos_a_espera_da_acao():
+    profiler = SelectorProfiler()
+    pagina = _PaginaPerfilada(profiler)
+
+    pagina.wait_for_locator(pagina.opcao)
+
+    stats = profiler.stats[("_PaginaPerfilada", "opcao")]
+    assert stats.match_counts == [1]
+    assert "not_found_on_use" not in stats.flags(slow_threshold_ms=25.0)
+
+
+def test_perfil_ignora_acao_que_falhou():
+    profiler = SelectorProfiler()
+    pagina = _PaginaPerfilada(profiler)
+
+    with pytest.raises(TimeoutError):
+        pagina.wait_for_locator(pagina.opcao_ausente)
+
+    assert profiler.stats == {}
+
+
+class _LocatorDesanexado(_LocatorFake):
+    """``count()`` falha no primeiro uso (ex.: frame navegou entre a espera e a medição)."""
+
+    def __init__(self, selector: str):
+        super().__init__(selector)
+        self.calls = 0
+
+    def count(self):
+        self.calls += 1
+        if self.calls == 1:
+            raise RuntimeError("Frame was detached")
+        return 1
+
+
+def test_perfil_sem_medicao_valida_nao_quebra_relatorio(tmp_path):
+    profiler = SelectorProfiler()
+    pagina = _PaginaPerfilada(profiler)
+    locator = _LocatorDesanexado("#nome")
+
+    profiler.profile(pagina, locator, locator)
+    assert profiler.stats == {}
+    assert profiler.report() == {}
+    assert profiler.export(output_dir=str(tmp_path)) == []
+
+    profiler.profile(pagina, locator, locator)
+    [entry] = profiler.report()["_PaginaPerfilada"]
+    assert entry["uses"] == 1
+
+
+def test_seletores_de_template_agrupados_pelo_rotulo():
+    profiler = SelectorProfiler()
+    page = SimpleNamespace(selector_profiler=profiler, locator=_LocatorRenderizadoAposEspera)
+    pagina = BasePage(page)
+
+    for mes in ("Janeiro", "Fevereiro"):
+        pagina.wait_for_locator(f"//li[.//span[normalize-space()='{mes}']]", label="mes_option")
+
+    assert list(profiler.stats) == [("BasePage", "mes_option")]
+    assert profiler.stats[("BasePage", "mes_option")].match_counts == [1, 1]
@@ -0,0 +1,41 @@
+import sys
+
+from core.startup_profiler import ImportTimer
+from util.lazy_import import lazy_import
+
+
+def test_import_timer_registra_tempo_proprio_e_acumulado(tmp_path, monkeypatch):
+    (tmp_path / "pacote_lento").mkdir()
+    (tmp_path / "pacote_lento" / "__init__.py").write_text("from pacote_lento import filho\n")
+    (tmp_path / "pacote_lento" / "filho.py").write_text("import time\ntime.sleep(0.02)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    timer = ImportTimer.install()
+    try:
+        import pacote_lento  # noqa: F401
+    finally:
+        timer.uninstall()
+        sys.modules.pop("pacote_lento", None)
+        sys.modules.pop("pacote_lento.filho", None)
+
+    timings = {item.name: item for item in timer.timings}
+    assert timings["pacote_lento.filho"].self_ms >= 15
+    assert timings["pacote_lento"].cumulative_ms >= timings["pacote_lento.filho"].cumulative_ms
+    assert timings["pacote_lento"].self_ms < timings["pacote_lento.filho"].self_ms
+
+
+def test_lazy_import_adia_execucao_ate_primeiro_acesso(tmp_path, monkeypatch):
+    (tmp_path / "modulo_adiado.py").write_text("CARREGADO = True\nimport builtins\nbuiltins._modulo_adiado_executado = True\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    import builtins
+
+    try:
+        module = lazy_import("modulo_adiado")
+        assert not hasattr(builtins, "_modulo_adiado_executado")
+
+        assert module.CARREGADO is True
+        assert builtins._modulo_adiado_executado is True
+    finally:
+        sys.modules.pop("modulo_adiado", None)
+        if hasattr(builtins, "_modulo_adiado_executado"):
+            del builtins._modulo_adiado_executado
@@ -0,0 +1,119 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from core.base_page import BasePage, DEFAULT_TIMEOUT
+from core.timeout_policy import DeadlineBudget, DeadlineExceeded, LocatorTimingStore, TimeoutPolicy
+
+
+class _LocatorLento:
+    """Locator falso que nunca fica pronto: consome o timeout inteiro e falha."""
+
+    def wait_for(self, state, timeout):
+        time.sleep(timeout / 1000)
+        raise TimeoutError(f"timeout {timeout}ms aguardando {state}")
+
+
+class _PaginaFake(BasePage):
+    def __init__(self, policy):
+        super().__init__(SimpleNamespace(timeout_policy=policy))
+        self.botao_inexistente = _LocatorLento()
+
+
+def test_timeout_adaptativo_usa_multiplo_do_p99(tmp_path):
+    store = LocatorTimingStore(base_dir=str(tmp_path))
+    for _ in range(10):
+        store.record("LoginPage.rapido", 100)
+        store.record("LoginPage.lento", 2000)
+    policy = TimeoutPolicy(default_timeout=DEFAULT_TIMEOUT, store=store)
+
+    assert policy.timeout_for("LoginPage.rapido") == 1000
+    assert policy.timeout_for("LoginPage.lento") == 6000
+    assert policy.timeout_for("LoginPage.sem_historico") == DEFAULT_TIMEOUT
+    assert policy.timeout_for("LoginPage.lento", explicit=500) == 500
+
+
+def test_historico_consolida_amostras_dos_workers(tmp_path):
+    for worker in ("gw0", "gw1"):
+        store = LocatorTimingStore(base_dir=str(tmp_path))
+        for _ in range(3):
+            store.record("LoginPage.avancar_button", 50)
+        store.save_pending(worker)
+
+    LocatorTimingStore(base_dir=str(tmp_path)).consolidate()
+
+    store = LocatorTimingStore(base_dir=str(tmp_path))
+    assert len(store.samples["LoginPage.avancar_button"]) == 6
+    assert not list((tmp_path / "pending").glob("*.json"))
+
+
+def test_orcamento_esgotado_falha_rapido_com_relatorio():
+    policy = TimeoutPolicy(default_timeout=DEFAULT_TIMEOUT, budget=DeadlineBudget(total_ms=200))
+    pagina = _PaginaFake(policy)
+
+    started = time.perf_counter()
+    with pytest.raises(DeadlineExceeded) as exc_info:
+        pagina.wait_for_locator(pagina.botao_inexistente)
+
+    assert time.perf_counter() - started < 2
+    assert "_PaginaFake.botao_inexistente" in str(exc_info.value)
+    assert "FALHOU" in str(exc_info.value)
+
+
+def test_boolean_helper_nao_mascara_orcamento_esgotado():
+    policy = TimeoutPolicy(default_timeout=DEFAULT_TIMEOUT, budget=DeadlineBudget(total_ms=100))
+    pagina = _PaginaFake(policy)
+
+    with pytest.raises(DeadlineExceeded):
+        pagina.exists(pagina.botao_inexistente)
+
+
+class _LocatorPronto:
+    """Locator falso sempre pronto: registra o timeout recebido por ``wait_for``."""
+
+    def __init__(self):
+        self.wait_timeouts = []
+
+    def is_visible(self, timeout=None):
+        return True
+
+    def wait_for(self, state, timeout):
+        self.wait_timeouts.append(timeout)
+
+
+def test_is_visible_nao_reduz_timeout_da_espera(tmp_path):
+    store = LocatorTimingStore(base_dir=str(tmp_path))
+    pagina = _PaginaFake(TimeoutPolicy(default_timeout=DEFAULT_TIMEOUT, store=store))
+    pagina.menu = _LocatorPronto()
+
+    for _ in range(10):
+        assert pagina.is_visible(pagina.menu)
+    pagina.wait_for_locator(pagina.menu)
+
+    assert pagina.menu.wait_timeouts == [DEFAULT_TIMEOUT]
+    assert list(store.samples) == ["_PaginaFake.menu:visible"]
+
+
+def test_historico_separa_tempo_ate_visivel_e_ate_oculto(tmp_path):
+    store = LocatorTimingStore(base_dir=str(tmp_path))
+    pagina = _PaginaFake(TimeoutPolicy(default_timeout=DEFAULT_TIMEOUT, store=store))
+    pagina.menu = _LocatorPronto()
+
+    pagina.get_visible(pagina.menu)
+    pagina.get_hidden(pagina.menu)
+
+    assert sorted(store.samples) == ["_PaginaFake.menu:hidden", "_PaginaFake.menu:visible"]
+
+
+def test_historico_separado_por_engine(tmp_path):
+    store = LocatorTimingStore(base_dir=str(tmp_path))
+    chromium = TimeoutPolicy(default_timeout=DEFAULT_TIMEOUT, store=store, engine="chromium")
+    webkit = TimeoutPolicy(default_timeout=DEFAULT_TIMEOUT, store=store, engine="webkit")
+
+    for _ in range(10):
+        chromium.spend("LoginPage.avancar_button:visible", "wait_visible", DEFAULT_TIMEOUT, 100, ok=True)
+
+    assert chromium.timeout_for("LoginPage.avancar_button:visible") == 1000
+    assert webkit.timeout_for("LoginPage.avancar_button:visible") == DEFAULT_TIMEOUT
+    assert list(store.samples) == ["chromium/LoginPage.avancar_button:visible"]
@@ -0,0 +1,112 @@
+from io import BytesIO
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from core.base_page import BasePage
+from core.visual_regression_service import VisualRegressionService
+
+
+def _png(pixels: np.ndarray) -> bytes:
+    buffer = BytesIO()
+    Image.fromarray(pixels).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _tela_base() -> np.ndarray:
+    pixels = np.zeros((60, 80, 3), dtype=np.uint8)
+    pixels[:, 40:] = 255
+    pixels[10:20, 10:30] = (0, 128, 255)
+    return pixels
+
+
+def test_visual_primeira_execucao_cria_baseline(tmp_path):
+    service = VisualRegressionService(baseline_dir=tmp_path / "baselines", diff_dir=tmp_path / "diffs")
+
+    result = service.check(_png(_tela_base()), "home")
+
+    assert result.passed and result.created_baseline
+    assert result.baseline_path.exists()
+    assert "home" in (tmp_path / "baselines" / "index.json").read_text(encoding="utf-8")
+
+
+def test_visual_imagem_identica_pula_diff(tmp_path):
+    service = VisualRegressionService(baseline_dir=tmp_path / "baselines", diff_dir=tmp_path / "diffs")
+    service.check(_png(_tela_base()), "home")
+
+    result = service.check(_png(_tela_base()), "home")
+
+    assert result.passed
+    assert result.hash_distance == 0
+    assert not result.full_diff
+
+
+def test_visual_diferenca_acima_da_tolerancia_falha_e_gera_diff(tmp_path):
+    service = VisualRegressionService(baseline_dir=tmp_path / "baselines", diff_dir=tmp_path / "diffs")
+    service.check(_png(_tela_base()), "home")
+    alterada = _tela_base()
+    alterada[30:60, 0:40] = 200
+
+    result = service.check(_png(alterada), "home")
+
+    assert not result.passed and result.full_diff
+    assert result.diff_ratio > 0.2
+    assert result.diff_path.exists()
+
+
+def test_visual_regiao_mascarada_e_ignorada(tmp_path):
+    service = VisualRegressionService(baseline_dir=tmp_path / "baselines", diff_dir=tmp_path / "diffs")
+    mascara = [(0, 30, 40, 30)]
+    service.check(_png(_tela_base()), "home", masks=mascara)
+    alterada = _tela_base()
+    alterada[30:60, 0:40] = 200
+
+    result = service.check(_png(alterada), "home", masks=mascara)
+
+    assert result.passed
+    assert result.diff_ratio == 0.0
+
+
+def test_visual_workers_paralelos_nao_perdem_entradas_do_indice(tmp_path):
+    workers = [
+        VisualRegressionService(baseline_dir=tmp_path / "baselines", diff_dir=tmp_path / "diffs") for _ in range(2)
+    ]
+    for worker in workers:
+        worker._load_index()  # ambos mantêm em cache o índice ainda vazio
+
+    workers[0].check(_png(_tela_base()), "home")
+    workers[1].check(_png(_tela_base()), "login")
+
+    index = VisualRegressionService(baseline_dir=tmp_path / "baselines")._load_index()
+    assert sorted(index) == ["home", "login"]
+
+
+def test_visual_baseline_gravado_sem_mascara(tmp_path):
+    service = VisualRegressionService(baseline_dir=tmp_path / "baselines", diff_dir=tmp_path / "diffs")
+    result = service.check(_png(_tela_base()), "home", masks=[(0, 0, 80, 60)])
+
+    with Image.open(result.baseline_path) as image:
+        assert np.array_equal(np.asarray(image.convert("RGB")), _tela_base())
+
+    alterada = _tela_base()
+    alterada[30:60, 0:40] = 200
+    assert not service.check(_png(alterada), "home").passed
+
+
+def test_checkpoint_usa_servico_anexado_a_pagina(tmp_path):
+    service = VisualRegressionService(baseline_dir=tmp_path / "baselines" / "firefox", diff_dir=tmp_path / "diffs")
+    page = SimpleNamespace(visual_service=service, screenshot=lambda: _png(_tela_base()))
+
+    result = BasePage(page).expect_visual_match("home")
+
+    assert result.created_baseline
+    assert result.baseline_path.parent == tmp_path / "baselines" / "firefox"
+
+
+def test_checkpoint_sem_servico_visual_falha():
+    page = SimpleNamespace(screenshot=lambda: _png(_tela_base()))
+
+    with pytest.raises(RuntimeError, match="VisualRegressionService"):
+        BasePage(page).expect_visual_match("home")
@@ -0,0 +1,92 @@
+import json
+
+from types import SimpleNamespace
+
+from core.web_vitals import WebVitalsCollector, aggregate_trends
+
+
+def _entry(run_id: str, lcp_ms: float) -> dict:
+    return {
+        "run_id": run_id,
+        "env": "hml",
+        "page_object": "LoginPage",
+        "event": "navigation",
+        "target": "https://www.google.com",
+        "metrics": {"lcp_ms": lcp_ms, "cls": 0.01, "fcp_ms": None},
+    }
+
+
+def test_tendencias_agrupam_percentis_por_execucao(tmp_path):
+    linhas = [_entry("run-1", value) for value in (100, 200, 300, 400)]
+    linhas += [_entry("run-2", value) for value in (1000, 1100)]
+    (tmp_path / "metrics.jsonl").write_text(
+        "\n".join(json.dumps(linha) for linha in linhas) + "\n", encoding="utf-8"
+    )
+
+    trends = json.loads(aggregate_trends(output_dir=str(tmp_path)).read_text(encoding="utf-8"))
+
+    grupo = trends["groups"][0]
+    assert grupo["page_object"] == "LoginPage" and grupo["env"] == "hml"
+    assert grupo["overall"]["lcp_ms"]["samples"] == 6
+    assert "fcp_ms" not in grupo["overall"]
+    assert [run["run_id"] for run in grupo["trend_p75"]] == ["run-1", "run-2"]
+    assert grupo["trend_p75"][0]["lcp_ms"] == 300
+    assert grupo["trend_p75"][1]["lcp_ms"] == 1100
+
+
+def test_tendencias_sem_historico(tmp_path):
+    assert aggregate_trends(output_dir=str(tmp_path)) is None
+
+
+def test_interacao_registra_apenas_metricas_da_propria_acao(tmp_path):
+    leitura_interacao = {
+        "navigated": False,
+        "ttfb_ms": None,
+        "lcp_ms": None,
+        "cls": 0.02,
+        "long_tasks": 1,
+        "long_task_ms": 80,
+    }
+    page = SimpleNamespace(url="https://www.google.com", evaluate=lambda script: dict(leitura_interacao))
+    collector = WebVitalsCollector(output_dir=str(tmp_path), run_id="run-1", tags={"env": "hml"})
+
+    collector.record(page, "LoginPage", "interaction", "avancar_button", duration_ms=35.0)
+
+    trends = json.loads(aggregate_trends(output_dir=str(tmp_path)).read_text(encoding="utf-8"))
+    assert sorted(trends["groups"][0]["overall"]) == ["cls", "duration_ms", "long_task_ms"]
+
+
+class _PaginaNavegandoNoClique:
+    """Clique troca o documento; até o ``load`` a leitura sai com timings zerados (null)."""
+
+    def __init__(self):
+        self.url = "https://www.google.com"
+        self.loaded = True
+        self.load_waits = 0
+
+    def click(self):
+        self.url = "https://www.google.com/conta"
+        self.loaded = False
+
+    def wait_for_load_state(self):
+        self.load_waits += 1
+        self.loaded = True
+
+    def evaluate(self, script):
+        if not self.loaded:
+            return {"navigated": False, "load_ms": None, "cls": 0.0}
+        return {"navigated": True, "load_ms": 420.0, "cls": 0.0}
+
+
+def test_interacao_com_navegacao_aguarda_load_antes_da_leitura(tmp_path):
+    page = _PaginaNavegandoNoClique()
+    collector = WebVitalsCollector(output_dir=str(tmp_path), run_id="run-1", tags={"env": "hml"})
+
+    collector.timed(page, "LoginPage", "interaction", "avancar_button", page.click)
+    collector.timed(page, "LoginPage", "interaction", "avancar_button", lambda: None)
+
+    entries = [json.loads(line) for line in (tmp_path / "metrics.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert page.load_waits == 1
+    assert entries[0]["url"] == "https://www.google.com/conta"
+    assert entries[0]["metrics"]["navigated"] is True
+    assert entries[0]["metrics"]["load_ms"] == 420.0
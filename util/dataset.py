@@ -0,0 +1,168 @@
+import csv
+import hashlib
+import json
+import os
+import random
+import uuid
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+INDEX_CACHE_DIR = ".cache/datasets"
+
+
+@dataclass(frozen=True)
+class RowRef:
+    """Referência leve a uma linha do dataset (usada como parâmetro do pytest)."""
+
+    path: str
+    number: int
+    offset: int
+
+    def __repr__(self) -> str:
+        return f"row{self.number}"
+
+
+class DatasetIndex:
+    """Índice de offsets (em bytes) das linhas de um arquivo JSONL ou CSV.
+
+    Na coleta apenas os offsets são mantidos em memória (8 bytes por linha); cada
+    linha é lida sob demanda com ``read``. O índice é salvo em ``.cache/datasets``
+    (chaveado por caminho, tamanho e mtime) e reutilizado pelos workers do xdist e
+    por execuções seguintes.
+
+    CSV deve ter cabeçalho e um registro por linha (sem quebras de linha em campos).
+    """
+
+    def __init__(self, path: str, cache_dir: Optional[str] = INDEX_CACHE_DIR):
+        self.path = Path(path)
+        if self.path.suffix.lower() not in (".jsonl", ".csv"):
+            raise ValueError(f"Dataset '{path}' não suportado. Use arquivos .jsonl ou .csv.")
+        self.is_csv = self.path.suffix.lower() == ".csv"
+        self.header: List[str] = []
+        self.offsets = array("Q")
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if not self._load_cache():
+            self._build()
+            self._save_cache()
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    # -------------------------------------------------------------------------
+    # Construção / cache do índice
+    # -------------------------------------------------------------------------
+    def _cache_path(self) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        stat = self.path.stat()
+        key = f"{self.path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        return self.cache_dir / f"{self.path.stem}-{digest}.idx"
+
+    def _build(self):
+        with self.path.open("rb") as data_file:
+            if self.is_csv:
+                header_line = data_file.readline()
+                self.header = next(csv.reader([header_line.decode("utf-8-sig")]))
+                position = len(header_line)
+            else:
+                position = 0
+            for line in data_file:
+                if line.strip():
+                    self.offsets.append(position)
+                position += len(line)
+
+    def _load_cache(self) -> bool:
+        cache_path = self._cache_path()
+        if cache_path is None or not cache_path.exists():
+            return False
+        with cache_path.open("rb") as cache_file:
+            header_line = cache_file.readline()
+            self.header = json.loads(header_line)
+            self.offsets.frombytes(cache_file.read())
+        return True
+
+    def _save_cache(self):
+        cache_path = self._cache_path()
+        if cache_path is None:
+            return
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{uuid.uuid4().hex[:8]}.tmp")
+        with tmp_path.open("wb") as cache_file:
+            cache_file.write(json.dumps(self.header).encode("utf-8") + b"\n")
+            cache_file.write(self.offsets.tobytes())
+        os.replace(tmp_path, cache_path)
+
+    # -------------------------------------------------------------------------
+    # Leitura / seleção
+    # -------------------------------------------------------------------------
+    def _parse(self, raw: bytes) -> dict:
+        text = raw.decode("utf-8").rstrip("\r\n")
+        if self.is_csv:
+            return dict(zip(self.header, next(csv.reader([text]))))
+        return json.loads(text)
+
+    def _read_from(self, data_file, offset: int) -> dict:
+        data_file.seek(offset)
+        return self._parse(data_file.readline())
+
+    def read(self, offset: int) -> dict:
+        """Lê e converte apenas a linha iniciada em ``offset``."""
+        with self.path.open("rb") as data_file:
+            return self._read_from(data_file, offset)
+
+    def select(
+        self,
+        rows: Optional[str] = None,
+        where: Optional[Dict[str, str]] = None,
+        sample: Optional[int] = None,
+        seed: int = 0,
+    ) -> List[RowRef]:
+        """Seleciona as linhas a parametrizar sem carregar o dataset em memória.
+
+        Args:
+            rows: Fatia ``inicio:fim`` sobre o número da linha (ex.: ``0:1000``).
+            where: Igualdade por campo (ex.: ``{"genero": "Homem"}``); exige uma
+                   leitura em streaming do arquivo durante a coleta.
+            sample: Quantidade de linhas sorteadas após os filtros.
+            seed: Semente do sorteio. Deve ser fixa para que todos os workers do
+                  xdist coletem os mesmos testes.
+
+        Returns:
+            Referências às linhas selecionadas, em ordem do arquivo.
+        """
+        numbers = range(len(self.offsets))
+        if rows:
+            start, _, stop = rows.partition(":")
+            numbers = numbers[slice(int(start) if start else None, int(stop) if stop else None)]
+        if where:
+            with self.path.open("rb") as data_file:
+                numbers = [
+                    number
+                    for number in numbers
+                    if all(
+                        str(self._read_from(data_file, self.offsets[number]).get(field)) == str(value)
+                        for field, value in where.items()
+                    )
+                ]
+        if sample is not None and sample < len(numbers):
+            numbers = sorted(random.Random(seed).sample(numbers, sample))
+        return [RowRef(str(self.path), number, self.offsets[number]) for number in numbers]
+
+
+_OPEN_INDEXES: Dict[str, DatasetIndex] = {}
+
+
+def open_index(path: str) -> DatasetIndex:
+    """Retorna o índice do dataset, aberto uma única vez por processo."""
+    index = _OPEN_INDEXES.get(str(path))
+    if index is None:
+        index = _OPEN_INDEXES[str(path)] = DatasetIndex(path)
+    return index
+
+
+def load_row(ref: RowRef) -> dict:
+    """Lê sob demanda a linha referenciada (chamado apenas quando o teste executa)."""
+    return open_index(ref.path).read(ref.offset)
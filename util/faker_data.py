@@ -1,22 +1,35 @@
-from faker import Faker
+from functools import lru_cache
 
-fake = Faker("pt_BR")  # Gera dados realistas em português do Brasil
+
+@lru_cache(maxsize=None)
+def get_fake():
+    """Instância única do Faker pt_BR, criada no primeiro uso (não na coleta dos testes)."""
+    from faker import Faker
+
+    return Faker("pt_BR")  # Gera dados realistas em português do Brasil
+
+
+def __getattr__(name):
+    # Compatibilidade com ``from util.faker_data import fake`` sem instanciar no import.
+    if name == "fake":
+        return get_fake()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def gerar_nome():
-    return fake.first_name()
+    return get_fake().first_name()
 
 def gerar_sobrenome():
-    return fake.last_name()
+    return get_fake().last_name()
 
 def gerar_full_name():
-    return fake.name()
+    return get_fake().name()
 
 def gerar_data_nascimento():
-    data = fake.date_of_birth(minimum_age=18, maximum_age=65)
+    data = get_fake().date_of_birth(minimum_age=18, maximum_age=65)
     return data.day, data.strftime("%B"), data.year
 
 def gerar_email(prefix="email"):
-    return f"{prefix}.{fake.random_number(digits=5)}".lower()
+    return f"{prefix}.{get_fake().random_number(digits=5)}".lower()
 
 def gerar_senha():
-    return fake.password(length=12, special_chars=True, digits=True, upper_case=True, lower_case=True)
+    return get_fake().password(length=12, special_chars=True, digits=True, upper_case=True, lower_case=True)
@@ -0,0 +1,27 @@
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Retorna o módulo ``name`` adiando sua execução até o primeiro acesso a um atributo.
+
+    Usado para dependências pesadas (Playwright, NumPy, Pillow) que não são necessárias
+    na coleta do pytest, em ``--collect-only`` ou nos workers que não executam o recurso.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+
+    parent, _, child = name.rpartition(".")
+    if parent:
+        setattr(sys.modules[parent], child, module)
+    return module
@@ -0,0 +1,84 @@
+import math
+from typing import Dict, Optional, Sequence
+
+
+class LatencyHistogram:
+    """Histograma de latências (ms) com buckets logarítmicos de memória constante.
+
+    Cada bucket cobre um intervalo ``(1 + precision)`` vezes maior que o anterior,
+    portanto os percentis têm erro relativo máximo de ``precision`` independentemente
+    do número de amostras registradas.
+    """
+
+    def __init__(self, precision: float = 0.05):
+        self.precision = precision
+        self._log_base = math.log1p(precision)
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _bucket(self, value_ms: float) -> int:
+        return int(math.log1p(max(value_ms, 0.0)) / self._log_base)
+
+    def _upper_bound(self, bucket: int) -> float:
+        return math.expm1((bucket + 1) * self._log_base)
+
+    def record(self, value_ms: float):
+        bucket = self._bucket(value_ms)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value_ms
+        self.min = value_ms if self.min is None else min(self.min, value_ms)
+        self.max = value_ms if self.max is None else max(self.max, value_ms)
+
+    def merge(self, other: "LatencyHistogram"):
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Retorna o percentil ``q`` (0-100) limitado ao intervalo [min, max] observado."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q / 100 * self.count))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(max(self._upper_bound(bucket), self.min), self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "min_ms": self.min,
+            "mean_ms": self.total / self.count if self.count else None,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max,
+        }
+
+    def to_dict(self) -> dict:
+        """Exporta o resumo junto com os buckets (limite superior em ms -> contagem)."""
+        data = self.summary()
+        data["buckets"] = {
+            f"{self._upper_bound(bucket):.3f}": count for bucket, count in sorted(self.buckets.items())
+        }
+        return data
+
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """Percentil ``q`` (0-100) por nearest-rank de uma lista pequena de amostras."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
@@ -1,6 +1,6 @@
 import unicodedata
 from dataclasses import dataclass
-from util.faker_data import fake
+from util.faker_data import get_fake
 
 
 def sanitizar(texto: str) -> str:
@@ -41,6 +41,7 @@ class UserBuilder:
 
     @staticmethod
     def build(genero: str = "Homem") -> UserData:
+        fake = get_fake()
         nome = fake.first_name_male() if genero == "Homem" else fake.first_name_female()
         sobrenome = fake.last_name()
 
@@ -76,3 +77,12 @@ class UserBuilder:
             ano=ano,
             genero=genero
         )
+
+    @staticmethod
+    def from_row(row: dict) -> UserData:
+        """Cria o usuário a partir de uma linha de dataset, completando campos ausentes com Faker."""
+        user = UserBuilder.build(genero=row.get("genero") or "Homem")
+        for campo, valor in row.items():
+            if hasattr(user, campo) and valor not in (None, ""):
+                setattr(user, campo, str(valor))
+        return user